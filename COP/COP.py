@@ -1,5 +1,8 @@
 import reflex as rx
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from rxconfig import config
+import metrics
 from COP import pacer, admin
 from db import get_user
 from COP.state import State 
@@ -40,7 +43,16 @@ def index() -> rx.Component:
     )
 
 
-app = rx.App()
+# Prometheus scrape target; Reflex's own routes are mounted underneath
+api = FastAPI()
+
+
+@api.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+app = rx.App(api_transformer=api)
 app.add_page(index, route="/")
 app.add_page(pacer.pacer, route="/pacer")
 app.add_page(admin.admin, route="/admin")
@@ -1,51 +1,50 @@
 import reflex as rx
 from COP.layout import with_sidebar
 from COP.state import State
-from db import fetch_all_regions, add_region, update_region, delete_region, get_conn
+from db_async import fetch_all_regions, add_region, update_region, delete_region, region_has_court, fetch_search_costs
 
 class RegionsState(rx.State):
     regions: list[dict] = []
     show_regions: bool = False
     new_region_name: str = ""
     region_error_message: str = ""
+    search_costs: list[dict] = []
 
-    def on_mount(self):
+    async def on_mount(self):
         """Initialize regions state and load data."""
         self.show_regions = False
-        self.load_regions_data()
+        await self.load_regions_data()
+        await self.load_search_costs()
 
-    def load_regions_data(self):
+    async def load_search_costs(self):
+        """Load per-region PACER search spend for the last 30 days."""
+        try:
+            self.search_costs = await fetch_search_costs(30)
+        except Exception as e:
+            print(f"Error loading search costs: {e}")
+            self.search_costs = []
+
+    async def load_regions_data(self):
         """Load regions data from database."""
         try:
-            self.regions = fetch_all_regions()
+            self.regions = await fetch_all_regions()
             self.show_regions = True
         except Exception as e:
             print(f"Error loading regions: {e}")
             self.regions = []
             self.show_regions = False
 
-    def validate_region_in_court_ids(self, region_name: str) -> bool:
-        """Check if region exists in court_ids table."""
+    async def validate_region_in_court_ids(self, region_name: str) -> bool:
+        """Check if region exists in court_ids table (cached lookup)."""
         if not region_name:
             return False
 
-        conn = get_conn()
-        if conn is None:
-            return False
-
         try:
-            cur = conn.cursor()
-            query = "SELECT COUNT(*) FROM court_ids WHERE region = %s"
-            cur.execute(query, (region_name,))
-            result = cur.fetchone()
-            count = result[0] if isinstance(result, tuple) else result.get("count", 0)
-            return count > 0
+            return await region_has_court(region_name)
         except Exception:
             return False
-        finally:
-            conn.close()
 
-    def add_new_region(self):
+    async def add_new_region(self):
         """Add new region to database after validation."""
         self.region_error_message = ""  # Clear previous error
         
@@ -54,32 +53,32 @@ class RegionsState(rx.State):
             return
             
         # Check if region is valid in court_ids table
-        if not self.validate_region_in_court_ids(self.new_region_name):
+        if not await self.validate_region_in_court_ids(self.new_region_name):
             self.region_error_message = "The PACER API does not support this region"
             return
             
         try:
-            add_region(self.new_region_name)
+            await add_region(self.new_region_name)
             self.new_region_name = ""
             self.region_error_message = ""
-            self.load_regions_data()
+            await self.load_regions_data()
         except Exception as e:
             print(f"Error adding region: {e}")
             self.region_error_message = "Error adding region to database"
 
-    def update_region_data(self, region_id: int, name: str):
+    async def update_region_data(self, region_id: int, name: str):
         """Update region in database."""
         try:
-            update_region(region_id, name)
-            self.load_regions_data()
+            await update_region(region_id, name)
+            await self.load_regions_data()
         except Exception as e:
             print(f"Error updating region: {e}")
 
-    def delete_region_data(self, region_id: int):
+    async def delete_region_data(self, region_id: int):
         """Delete region from database."""
         try:
-            delete_region(region_id)
-            self.load_regions_data()
+            await delete_region(region_id)
+            await self.load_regions_data()
         except Exception as e:
             print(f"Error deleting region: {e}")
 
@@ -272,6 +271,33 @@ def admin() -> rx.Component:
                         align="start"
                     ),
 
+                    # PACER search costs (from the search ledger)
+                    rx.divider(margin_y="1em"),
+                    rx.heading("PACER Search Costs (last 30 days)", size="5"),
+                    rx.hstack(
+                        rx.box(rx.text("Region", weight="bold"), width="30%"),
+                        rx.box(rx.text("Searches", weight="bold"), width="12%"),
+                        rx.box(rx.text("Cache Hits", weight="bold"), width="12%"),
+                        rx.box(rx.text("Fees ($)", weight="bold"), width="12%"),
+                        rx.box(rx.text("Billable Pages", weight="bold"), width="12%"),
+                        rx.box(rx.text("Results", weight="bold"), width="10%"),
+                        rx.box(rx.text("Avg ms", weight="bold"), width="12%"),
+                        width="100%"
+                    ),
+                    rx.foreach(
+                        RegionsState.search_costs,
+                        lambda row: rx.hstack(
+                            rx.box(rx.text(row["region"], size="2"), width="30%"),
+                            rx.box(rx.text(row["searches"], size="2"), width="12%"),
+                            rx.box(rx.text(row["cache_hits"], size="2"), width="12%"),
+                            rx.box(rx.text(row["fees"], size="2"), width="12%"),
+                            rx.box(rx.text(row["billable_pages"], size="2"), width="12%"),
+                            rx.box(rx.text(row["results"], size="2"), width="10%"),
+                            rx.box(rx.text(row["avg_latency_ms"], size="2"), width="12%"),
+                            width="100%",
+                        )
+                    ),
+
                     spacing="4",
                     align="start",
                     padding_top="0.0em",  
@@ -3,8 +3,33 @@ import reflex as rx
 from COP.layout import with_sidebar
 from COP.state import State
 import pacer_api
+import metrics
+import scoring
+import asyncio
+from contextlib import aclosing
 from datetime import date, timedelta
-from db import fetch_all_cases, fetch_all_regions
+from typing import Optional
+from db import SEARCH_COUNT_CAP
+from db_async import fetch_cached_regions, fetch_cases_page, count_cases, delete_cases_by_keys
+
+# Virtualized grid geometry: rows have a fixed height so a scroll offset maps
+# straight to a row index; only WINDOW_ROWS rows are ever in state / the DOM.
+ROW_HEIGHT_PX = 36
+VIEWPORT_HEIGHT_PX = 600
+WINDOW_ROWS = 60
+OVERSCAN_ROWS = 15
+# Browsers clamp element heights (~17.9M px in Firefox, ~33.5M px in Chrome).
+# Past this many pixels the spacer stops growing and the scrollbar maps onto
+# row indexes proportionally; inside the loaded window scrolling stays 1:1.
+MAX_GRID_HEIGHT_PX = 15_000_000
+GRID_ID = "pacer-cases-grid"
+
+# How often a running ingestion pushes its per-region progress to the page
+PROGRESS_INTERVAL_S = 1.0
+
+
+def scroll_grid_to_top():
+    return rx.call_script(f"document.getElementById('{GRID_ID}').scrollTop = 0")
 
 
 class PacerPageState(rx.State):
@@ -19,18 +44,37 @@ class PacerPageState(rx.State):
     cases_loaded_count: int = 0
     show_cases_loaded: bool = False
 
-    # NEW: minimal state to reset checkboxes + show a message
-    form_nonce: int = 0
     delete_status: str = ""
 
-    def on_mount(self):
+    # Background ingestion (load_more_cases) status panel
+    ingest_running: bool = False
+    cancel_requested: bool = False
+    ingest_status: str = ""
+    ingest_progress: list[dict] = []
+
+    # Virtualized grid: `rows` holds only the window starting at row index
+    # `window_start`, drawn `window_top_px` down a scroll container sized for
+    # `total_cases` rows (capped at MAX_GRID_HEIGHT_PX)
+    window_start: int = 0
+    window_top_px: int = 0
+    total_cases: int = 0
+    court_filter: str = ""
+    # Text in the search box vs. the search the grid is currently showing;
+    # while a search is active rows default to sort_column "rank" (relevance)
+    search_query: str = ""
+    active_search: str = ""
+    # "court_id__case_id" keys of checked rows; kept in state because rows
+    # scrolled out of the window are unmounted
+    selected_cases: list[str] = []
+
+    async def on_mount(self):
         self.show_grid = False
-        self.load_regions()
-        self.load_grid_data()
+        await self.load_regions()
+        await self.load_grid_data()
 
-    def load_regions(self):
+    async def load_regions(self):
         try:
-            self.regions = fetch_all_regions()
+            self.regions = await fetch_cached_regions()
         except Exception as e:
             print(f"Error loading regions: {e}")
             self.regions = []
@@ -42,126 +86,378 @@ class PacerPageState(rx.State):
             options.append(region["region_name"])
         return options
 
-    def load_grid_data(self):
+    @metrics.timed("handler", handler="load_grid_data")
+    async def load_grid_data(self):
+        """Reset to the newest cases (date_filed desc) and fetch the first window."""
+        self.sort_column = "date_filed"
+        self.sort_ascending = False
+        self.search_query = ""
+        self.active_search = ""
+        await self.refresh_total()
+        await self.fetch_window(0)
+
+    async def refresh_total(self):
+        # Only on reload/filter change, so scrolling never pays for count(*)
         try:
-            self.rows = fetch_all_cases()
-            self.sort_column = "date_filed"
-            self.sort_ascending = False
-
-            def sort_key(item):
-                value = item.get("date_filed", "")
-                if value is None:
-                    return ""
-                return str(value).lower()
-
-            self.rows = sorted(self.rows, key=sort_key, reverse=True)
+            self.total_cases = await count_cases(self.court_filter.strip() or None, self.active_search or None)
+        except Exception as e:
+            print(f"Error counting cases: {e}")
+            self.total_cases = 0
+
+    def _clamp_start(self, start: int) -> int:
+        return max(0, min(start, max(0, self.total_cases - WINDOW_ROWS)))
+
+    def _scroll_rows(self) -> tuple[int, int]:
+        """(scrollable pixels, scrollable rows) of the grid; equal up to ROW_HEIGHT_PX until capped."""
+        height = min(self.total_cases * ROW_HEIGHT_PX, MAX_GRID_HEIGHT_PX)
+        return max(0, height - VIEWPORT_HEIGHT_PX), max(0, self.total_cases - VIEWPORT_HEIGHT_PX // ROW_HEIGHT_PX)
+
+    def _row_px(self, row: int) -> int:
+        """Scroll offset that shows `row` at the top of the viewport."""
+        px, rows = self._scroll_rows()
+        if self.total_cases * ROW_HEIGHT_PX <= MAX_GRID_HEIGHT_PX or not rows:
+            return row * ROW_HEIGHT_PX
+        return round(min(row, rows) * px / rows)
+
+    def _px_row(self, scroll_top: int) -> int:
+        """Row index at the top of the viewport for a scroll offset (inverse of _row_px)."""
+        px, rows = self._scroll_rows()
+        if self.total_cases * ROW_HEIGHT_PX <= MAX_GRID_HEIGHT_PX or not px:
+            return scroll_top // ROW_HEIGHT_PX
+        return round(min(scroll_top, px) * rows / px)
+
+    async def fetch_window(self, start: int, top_px: Optional[int] = None):
+        """Fetch WINDOW_ROWS rows from row index `start`; ordering and filtering happen in SQL.
+
+        The window is drawn at `top_px`, by default where the scrollbar maps row `start`.
+        """
+        try:
+            start = self._clamp_start(start)
+            court_id = self.court_filter.strip() or None
+            search = self.active_search or None
+            end = self.window_start + len(self.rows)
+            if self.rows and self.window_start < start <= end and self.sort_column != "rank":
+                # Scrolling forward into/just past the current window: continue
+                # from a keyset cursor instead of paying for OFFSET
+                anchor = self.rows[start - self.window_start - 1]
+                value = anchor.get(self.sort_column)
+                after = (None if value is None else str(value), anchor.get("case_id"))
+                rows = await fetch_cases_page(self.sort_column, self.sort_ascending, after,
+                                              limit=WINDOW_ROWS, court_id=court_id, search=search)
+            else:
+                rows = await fetch_cases_page(self.sort_column, self.sort_ascending, limit=WINDOW_ROWS,
+                                              court_id=court_id, offset=start, search=search)
+            self.window_start = start
+            self.window_top_px = self._row_px(start) if top_px is None else max(0, top_px)
+            self.rows = rows
             self.show_grid = True
         except Exception as e:
             print(f"Error: {e}")
             self.rows = []
+            self.window_start = 0
+            self.window_top_px = 0
             self.show_grid = False
 
-    def load_more_cases(self):
-        df = self.date_from or (date.today() - timedelta(days=1)).isoformat()
-        dt = self.date_to or (date.today() - timedelta(days=1)).isoformat()
-
-        cfg = pacer_api.env_cfg(pacer_api.ENV)
-        token = pacer_api.authenticate(cfg["USERNAME"], cfg["PASSWORD"], cfg["AUTH_URL"])
-        if not token:
-            self.cases_loaded_count = 0
-            self.show_cases_loaded = True
+    async def on_grid_scroll(self, scroll_top):
+        """Throttled scroll callback: refetch only when the viewport leaves the loaded window."""
+        try:
+            scroll_top = max(0, int(float(scroll_top or 0)))
+        except (TypeError, ValueError):
+            return
+        # Rows inside the loaded window sit at their natural height below window_top_px
+        first = self.window_start + (scroll_top - self.window_top_px) // ROW_HEIGHT_PX
+        last = first + VIEWPORT_HEIGHT_PX // ROW_HEIGHT_PX
+        loaded_end = self.window_start + len(self.rows)
+        at_top = scroll_top == 0 and self.window_start > 0
+        if (self.window_top_px <= scroll_top and not at_top
+                and (last <= loaded_end or loaded_end >= self.total_cases)):
+            return
+        # Left the window: map the scrollbar to a row and draw the new window
+        # so that row lands exactly at the current scroll offset
+        first = self._px_row(scroll_top)
+        start = self._clamp_start(first - OVERSCAN_ROWS)
+        await self.fetch_window(start, scroll_top - (first - start) * ROW_HEIGHT_PX)
+
+    async def apply_court_filter(self):
+        await self.refresh_total()
+        self.rows = []
+        await self.fetch_window(0)
+        return scroll_grid_to_top()
+
+    @metrics.timed("handler", handler="apply_search")
+    async def apply_search(self):
+        """Show search matches (best first) in the grid; an empty box restores the full list."""
+        self.active_search = self.search_query.strip()
+        if self.active_search:
+            self.sort_column = "rank"
+            self.sort_ascending = False
+        elif self.sort_column == "rank":
+            self.sort_column = "date_filed"
+            self.sort_ascending = False
+        await self.refresh_total()
+        self.rows = []
+        await self.fetch_window(0)
+        return scroll_grid_to_top()
+
+    async def on_search_key(self, key: str):
+        if key == "Enter":
+            return await self.apply_search()
+
+    async def clear_search(self):
+        self.search_query = ""
+        return await self.apply_search()
+
+    def set_case_selected(self, key: str, checked: bool):
+        if checked and key not in self.selected_cases:
+            self.selected_cases = self.selected_cases + [key]
+        elif not checked and key in self.selected_cases:
+            self.selected_cases = [k for k in self.selected_cases if k != key]
+
+    # ---------- incremental window patching ----------
+    def _order_key(self, row: dict) -> tuple:
+        # Mirrors ORDER BY <col>, case_id with NULLs last (ascending space)
+        value = row.get(self.sort_column)
+        if self.sort_column not in ("case_id", "rank", "opportunity_score") and value is not None:
+            value = str(value)
+        return (value is None, value if value is not None else "", row.get("case_id") or 0)
+
+    def _sorts_before(self, a: dict, b: dict) -> bool:
+        ka, kb = self._order_key(a), self._order_key(b)
+        return ka < kb if self.sort_ascending else ka > kb
+
+    def _in_filter(self, row: dict) -> bool:
+        if self.active_search:
+            return False  # match/rank is decided in SQL; new matches show on the next search
+        court_id = self.court_filter.strip()
+        return not court_id or row.get("court_id") == court_id
+
+    async def _top_up_window(self):
+        """Refill the window's tail with a keyset query after rows were removed from it."""
+        missing = WINDOW_ROWS - len(self.rows)
+        if missing <= 0 or self.window_start + len(self.rows) >= self.total_cases:
             return
+        after = None
+        if self.rows and self.sort_column != "rank":
+            value = self.rows[-1].get(self.sort_column)
+            after = (None if value is None else str(value), self.rows[-1].get("case_id"))
+        extra = await fetch_cases_page(self.sort_column, self.sort_ascending, after, limit=missing,
+                                       court_id=self.court_filter.strip() or None,
+                                       offset=0 if after else self.window_start + len(self.rows),
+                                       search=self.active_search or None)
+        self.rows = self.rows + extra
+
+    def apply_upserted(self, inserted_rows: list[dict], updated_rows: list[dict]):
+        """Patch the loaded window with rows written by an upsert instead of reloading the grid."""
+        rows = list(self.rows)
+        by_id = {r.get("case_id"): i for i, r in enumerate(rows)}
+        for r in updated_rows:
+            i = by_id.get(r.get("case_id"))
+            if i is not None:
+                # Upserted rows carry no search `rank`; keep the one the window was
+                # ranked with so re-sorting leaves the row where it was
+                rows[i] = {**r, "rank": rows[i]["rank"]} if "rank" in rows[i] and "rank" not in r else r
+
+        first = rows[0] if rows else None
+        last = rows[-1] if rows else None
+        more_below = self.window_start + len(rows) < self.total_cases
+        for r in inserted_rows:
+            if not self._in_filter(r):
+                continue
+            self.total_cases += 1
+            if self.window_start > 0 and first is not None and self._sorts_before(r, first):
+                self.window_start += 1        # lands above the window: indexes shift down
+                self.window_top_px += ROW_HEIGHT_PX
+            elif last is None or not more_below or not self._sorts_before(last, r):
+                rows.append(r)                # lands inside (or at the open end of) the window
+
+        rows.sort(key=self._order_key, reverse=not self.sort_ascending)
+        self.rows = rows[:WINDOW_ROWS]
+
+    async def apply_deleted(self, deleted_rows: list[dict]):
+        """Drop deleted rows from the loaded window and keep its row indexes aligned."""
+        gone = {r.get("case_id") for r in deleted_rows}
+        in_window = {r.get("case_id") for r in self.rows}
+        first = self.rows[0] if self.rows else None
+        for r in deleted_rows:
+            if not (self._in_filter(r) or r.get("case_id") in in_window):
+                continue
+            self.total_cases = max(0, self.total_cases - 1)
+            if first is not None and r.get("case_id") not in in_window and self._sorts_before(r, first):
+                if self.window_start > 0:  # was above the window
+                    self.window_start -= 1
+                    self.window_top_px = max(0, self.window_top_px - ROW_HEIGHT_PX)
+        self.rows = [r for r in self.rows if r.get("case_id") not in gone]
+        await self._top_up_window()
 
-        all_cases = []
-        if self.selected_region == "All":
-            for region_data in self.regions:
-                region_name = region_data["region_name"]
-                print(f"Searching region: {region_name}")
-                cases = pacer_api.search_cases_by_date(token, cfg["PCL_API_ROOT"], df, dt, region_name)
-                if cases:
-                    all_cases.extend(cases)
-        else:
-            cases = pacer_api.search_cases_by_date(token, cfg["PCL_API_ROOT"], df, dt, self.selected_region)
-            if cases:
-                all_cases.extend(cases)
+    @rx.var
+    def grid_height(self) -> str:
+        return f"{min(self.total_cases * ROW_HEIGHT_PX, MAX_GRID_HEIGHT_PX)}px"
 
-        self.cases_loaded_count = len(all_cases)
-        self.show_cases_loaded = True
-        pacer_api.upsert_pacer_cases(all_cases)
-        self.load_grid_data()
+    @rx.var
+    def window_offset(self) -> str:
+        return f"{self.window_top_px}px"
+
+    @rx.event(background=True)
+    @metrics.timed("handler", handler="load_more_cases")
+    async def load_more_cases(self):
+        """Ingest in the background: search -> upsert -> patch grid, with per-region progress."""
+        async with self:
+            if self.ingest_running:
+                return
+            df = self.date_from or (date.today() - timedelta(days=1)).isoformat()
+            dt = self.date_to or (date.today() - timedelta(days=1)).isoformat()
+            if self.selected_region == "All":
+                region_names = [region_data["region_name"] for region_data in self.regions]
+            else:
+                region_names = [self.selected_region]
+            self.ingest_running = True
+            self.cancel_requested = False
+            self.ingest_status = "Authenticating..."
+            self.cases_loaded_count = 0
+            self.show_cases_loaded = False
+            progress = {
+                name: {"region": name, "status": "queued", "fetched": 0, "inserted": 0, "updated": 0, "unchanged": 0}
+                for name in region_names
+            }
+            self.ingest_progress = [dict(p) for p in progress.values()]
+
+        def on_status(region: str, status: str):
+            progress[region]["status"] = status
+
+        async def push_progress():
+            async with self:
+                self.ingest_progress = [dict(p) for p in progress.values()]
+
+        async def ticker():
+            # Region status changes between pages still reach the panel
+            while True:
+                await asyncio.sleep(PROGRESS_INTERVAL_S)
+                await push_progress()
+
+        total = 0
+        cancelled = False
+        run_failed = False
+        written_ids: list[int] = []
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            cfg = pacer_api.env_cfg(pacer_api.ENV)
+            # Cached across clicks/workers; only logs in when the token is near expiry
+            token = await asyncio.to_thread(pacer_api.get_token, pacer_api.ENV)
+            if not token:
+                run_failed = True
+                async with self:
+                    self.ingest_status = "Authentication failed"
+                    self.show_cases_loaded = True
+                return
 
-    def delete_cases(self, form_data: dict):
-        """Delete checked rows from pacer_cases, refresh grid, reset checkboxes, and show status."""
+            async with self:
+                self.ingest_status = "Searching PACER..."
+
+            # Regions are searched concurrently; each page is upserted as soon as it
+            # lands and the written rows are patched into the visible window
+            search = pacer_api.search_regions_concurrently(
+                token, cfg["PCL_API_ROOT"], df, dt, region_names, on_status=on_status
+            )
+            async with aclosing(search):
+                async for region_name, cases in search:
+                    async with self:
+                        cancelled = self.cancel_requested
+                    if cancelled:
+                        break
+                    counts = await asyncio.to_thread(pacer_api.upsert_pacer_cases, cases, return_rows=True)
+                    # Only genuinely new cases count; re-fetched ones are updated or skipped
+                    total += counts["inserted"]
+                    p = progress[region_name]
+                    p["fetched"] += len(cases)
+                    p["inserted"] += counts["inserted"]
+                    p["updated"] += counts["updated"]
+                    p["unchanged"] += counts["unchanged"]
+                    written_ids.extend(r["case_id"] for r in counts["inserted_rows"] + counts["updated_rows"])
+                    async with self:
+                        self.apply_upserted(counts["inserted_rows"], counts["updated_rows"])
+                        self.cases_loaded_count = total
+                        self.ingest_progress = [dict(p) for p in progress.values()]
+
+            # Score just the cases this run wrote, then show their scores
+            if written_ids:
+                async with self:
+                    self.ingest_status = "Scoring..."
+                await asyncio.to_thread(scoring.score_pending, case_ids=written_ids)
+                async with self:
+                    await self.fetch_window(self.window_start, self.window_top_px)
+        except Exception as e:
+            print(f"Error in load_more_cases: {type(e).__name__}: {e}")
+            run_failed = True
+            async with self:
+                self.ingest_status = f"Failed: {type(e).__name__}"
+        else:
+            failed = [p["region"] for p in progress.values() if p["status"] == "failed"]
+            async with self:
+                if cancelled:
+                    self.ingest_status = "Cancelled"
+                elif failed:
+                    self.ingest_status = f"Finished; {len(failed)} region(s) failed: {', '.join(failed)}"
+                else:
+                    self.ingest_status = "Finished"
+        finally:
+            ticker_task.cancel()
+            # Regions the run never finished: a cancel stops them, an error fails them
+            for p in progress.values():
+                if p["status"] in ("queued", "running") and (cancelled or run_failed):
+                    p["status"] = "cancelled" if cancelled else "failed"
+            async with self:
+                self.ingest_progress = [dict(p) for p in progress.values()]
+                self.cases_loaded_count = total
+                self.show_cases_loaded = True
+                self.ingest_running = False
+
+    def cancel_ingest(self):
+        if self.ingest_running:
+            self.cancel_requested = True
+            self.ingest_status = "Cancelling..."
+
+    @metrics.timed("handler", handler="delete_cases")
+    async def delete_cases(self):
+        """Delete checked rows from pacer_cases, patch them out of the grid, clear the selection, and show status."""
         # Clear any previous message immediately
         self.delete_status = ""
         try:
-            # Collect all keys like: to_delete__<court_id>__<case_id>
+            # Selection keys look like: <court_id>__<case_id>
             pairs: list[tuple[str, int]] = []
-            for k, v in (form_data or {}).items():
-                if isinstance(k, str) and k.startswith("to_delete__"):
-                    try:
-                        _, court_id, case_id_str = k.split("__", 2)
-                        pairs.append((court_id, int(case_id_str)))
-                    except Exception as e:
-                        print(f"Skipping malformed form key {k!r}: {e}")
+            for k in self.selected_cases:
+                try:
+                    court_id, case_id_str = k.rsplit("__", 1)
+                    pairs.append((court_id, int(case_id_str)))
+                except Exception as e:
+                    print(f"Skipping malformed selection key {k!r}: {e}")
 
             if not pairs:
                 self.delete_status = "Delete unsuccessful"
-                self.form_nonce += 1   # force form remount to clear any lingering checks
-                return
-
-            from db import get_conn
-            conn = get_conn()
-            if not conn:
-                print("Database connection failed in delete_cases.")
-                self.delete_status = "Delete unsuccessful"
-                self.form_nonce += 1
+                self.selected_cases = []
                 return
 
-            # Single DELETE using VALUES to avoid prepared statement reuse issues
-            placeholders = ",".join(["(%s,%s)"] * len(pairs))
-            params: list = []
-            for court_id, case_id in pairs:
-                params.extend([court_id, case_id])
-
-            sql = f"""
-                DELETE FROM pacer_cases AS p
-                USING (VALUES {placeholders}) AS v(court_id, case_id)
-                WHERE p.court_id = v.court_id AND p.case_id = v.case_id
-            """
-
-            try:
-                with conn:
-                    with conn.cursor() as cur:
-                        cur.execute(sql, params)
-                self.delete_status = "Delete successful"
-                self.load_grid_data()
-            finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+            deleted = await delete_cases_by_keys(pairs)
+            self.delete_status = "Delete successful"
+            await self.apply_deleted(deleted)
         except Exception as e:
             print(f"Error in delete_cases: {type(e).__name__}: {e}")
             self.delete_status = "Delete unsuccessful"
         finally:
-            # Always bump to remount the form and clear all checkboxes
-            self.form_nonce += 1
+            # Always clear all checkboxes
+            self.selected_cases = []
 
-    def sort_data(self, column: str):
+    async def sort_data(self, column: str):
         if self.sort_column == column:
             self.sort_ascending = not self.sort_ascending
         else:
             self.sort_column = column
-            self.sort_ascending = True
+            # Best opportunities first; every other column starts ascending
+            self.sort_ascending = column != "opportunity_score"
 
-        def sort_key(item):
-            value = item.get(column, "")
-            if value is None:
-                return ""
-            return str(value).lower()
-
-        self.rows = sorted(self.rows, key=sort_key, reverse=not self.sort_ascending)
+        # ORDER BY is pushed to Postgres; restart from the top of the grid
+        self.rows = []
+        await self.fetch_window(0)
+        return scroll_grid_to_top()
 
     @rx.var
     def sort_icon_case_title(self) -> str:
@@ -193,20 +489,64 @@ class PacerPageState(rx.State):
             return "↕"
         return "↑" if self.sort_ascending else "↓"
 
-    def sort_by_case_title(self):
-        self.sort_data("case_title")
+    @rx.var
+    def sort_icon_opportunity_score(self) -> str:
+        if self.sort_column != "opportunity_score":
+            return "↕"
+        return "↑" if self.sort_ascending else "↓"
+
+    async def sort_by_case_title(self):
+        return await self.sort_data("case_title")
+
+    async def sort_by_court_id(self):
+        return await self.sort_data("court_id")
 
-    def sort_by_court_id(self):
-        self.sort_data("court_id")
+    async def sort_by_case_id(self):
+        return await self.sort_data("case_id")
 
-    def sort_by_case_id(self):
-        self.sort_data("case_id")
+    async def sort_by_case_number(self):
+        return await self.sort_data("case_number")
 
-    def sort_by_case_number(self):
-        self.sort_data("case_number")
+    async def sort_by_date_filed(self):
+        return await self.sort_data("date_filed")
 
-    def sort_by_date_filed(self):
-        self.sort_data("date_filed")
+    async def sort_by_opportunity_score(self):
+        return await self.sort_data("opportunity_score")
+
+
+def case_row(case_data) -> rx.Component:
+    key = f"{case_data['court_id']}__{case_data['case_id']}"
+    cell = {"white_space": "nowrap", "overflow": "hidden", "text_overflow": "ellipsis"}
+    return rx.hstack(
+        rx.box(
+            rx.link(
+                case_data["case_title"],
+                href=case_data["case_link"],
+                target="_blank",
+                size="2"
+            ),
+            width="25%",
+            **cell,
+        ),
+        rx.box(rx.text(case_data["court_id"], size="2"), width="12%", **cell),
+        rx.box(rx.text(case_data["case_id"], size="2"), width="15%", **cell),
+        rx.box(rx.text(case_data["case_number"], size="2"), width="15%", **cell),
+        rx.box(rx.text(case_data["date_filed"], size="2"), width="13%", **cell),
+        rx.box(rx.text(case_data["opportunity_score"], size="2"), width="10%", **cell),
+        rx.box(
+            rx.checkbox(
+                checked=PacerPageState.selected_cases.contains(key),
+                on_change=lambda checked: PacerPageState.set_case_selected(key, checked),
+            ),
+            width="10%",
+        ),
+        # Fixed height keeps scrollTop -> row index arithmetic exact
+        height=f"{ROW_HEIGHT_PX}px",
+        align="center",
+        border_bottom="1px solid #ddd",
+        box_sizing="border-box",
+        width="100%",
+    )
 
 
 def pacer() -> rx.Component:
@@ -257,20 +597,29 @@ def pacer() -> rx.Component:
             wrap="wrap",
         ),
 
-        # Wrap actions + table in a form to submit checked boxes
-        rx.form(
+        # Actions + table; checked rows live in PacerPageState.selected_cases
+        rx.box(
             rx.vstack(
                 rx.hstack(
                     rx.button("Load more cases", 
                               type="button",
+                              loading=PacerPageState.ingest_running,
                               on_click=[PacerPageState.set_delete_status(""),
                                         PacerPageState.set_show_cases_loaded(False),
                                         PacerPageState.load_more_cases,
                                         ]),
+                    rx.cond(
+                        PacerPageState.ingest_running,
+                        rx.button("Cancel", type="button", color_scheme="red", variant="soft",
+                                  disabled=PacerPageState.cancel_requested,
+                                  on_click=PacerPageState.cancel_ingest),
+                        rx.fragment(),
+                    ),
                     
-                    rx.button("Delete Cases", type="submit", 
+                    rx.button("Delete Cases", type="button",
                               on_click=[PacerPageState.set_delete_status(""),
-                                        PacerPageState.set_show_cases_loaded(False)]),
+                                        PacerPageState.set_show_cases_loaded(False),
+                                        PacerPageState.delete_cases]),
                     rx.cond(
                         PacerPageState.show_cases_loaded,
                         rx.text(
@@ -292,8 +641,78 @@ def pacer() -> rx.Component:
                     width="100%",
                 ),
 
+                # Ingestion status panel (per-region progress of the background load)
+                rx.cond(
+                    PacerPageState.ingest_progress.length() > 0,
+                    rx.box(
+                        rx.vstack(
+                            rx.text(PacerPageState.ingest_status, weight="medium", size="2"),
+                            rx.hstack(
+                                rx.box(rx.text("Region", weight="bold", size="2"), width="35%"),
+                                rx.box(rx.text("Status", weight="bold", size="2"), width="13%"),
+                                rx.box(rx.text("Fetched", weight="bold", size="2"), width="13%"),
+                                rx.box(rx.text("New", weight="bold", size="2"), width="13%"),
+                                rx.box(rx.text("Updated", weight="bold", size="2"), width="13%"),
+                                rx.box(rx.text("Unchanged", weight="bold", size="2"), width="13%"),
+                                width="100%",
+                            ),
+                            rx.foreach(
+                                PacerPageState.ingest_progress,
+                                lambda p: rx.hstack(
+                                    rx.box(rx.text(p["region"], size="2"), width="35%"),
+                                    rx.box(rx.text(p["status"], size="2"), width="13%"),
+                                    rx.box(rx.text(p["fetched"], size="2"), width="13%"),
+                                    rx.box(rx.text(p["inserted"], size="2"), width="13%"),
+                                    rx.box(rx.text(p["updated"], size="2"), width="13%"),
+                                    rx.box(rx.text(p["unchanged"], size="2"), width="13%"),
+                                    width="100%",
+                                ),
+                            ),
+                            spacing="1",
+                            width="100%",
+                        ),
+                        border="1px solid #ddd",
+                        padding="0.75em",
+                        width="100%",
+                    ),
+                    rx.fragment(),
+                ),
+
                 rx.text("Cases previously retrieved from PACER", weight="bold", size="4", mt="5", align="left", width="100%"),
 
+                rx.hstack(
+                    rx.input(
+                        placeholder="Search case title or number",
+                        value=PacerPageState.search_query,
+                        on_change=PacerPageState.set_search_query,
+                        on_key_down=PacerPageState.on_search_key,
+                        width="20rem",
+                    ),
+                    rx.button("Search", type="button", on_click=PacerPageState.apply_search),
+                    rx.cond(
+                        PacerPageState.active_search != "",
+                        rx.button("Clear", type="button", variant="soft", color_scheme="gray",
+                                  on_click=PacerPageState.clear_search),
+                        rx.fragment(),
+                    ),
+                    rx.input(
+                        placeholder="Filter by court ID",
+                        value=PacerPageState.court_filter,
+                        on_change=PacerPageState.set_court_filter,
+                        width="14rem",
+                    ),
+                    rx.button("Filter", type="button", variant="soft", on_click=PacerPageState.apply_court_filter),
+                    rx.spacer(),
+                    rx.cond(
+                        (PacerPageState.active_search != "") & (PacerPageState.total_cases >= SEARCH_COUNT_CAP),
+                        rx.text(f"{SEARCH_COUNT_CAP}+ matches", size="2"),
+                        rx.text(f"{PacerPageState.total_cases} cases", size="2"),
+                    ),
+                    align="center",
+                    spacing="3",
+                    width="100%",
+                ),
+
                 rx.cond(
                     PacerPageState.show_grid,
                     rx.box(
@@ -324,7 +743,7 @@ def pacer() -> rx.Component:
                                         ),
                                         spacing="1",
                                     ),
-                                    width="20%"
+                                    width="12%"
                                 ),
                                 rx.box(
                                     rx.hstack(
@@ -337,7 +756,7 @@ def pacer() -> rx.Component:
                                         ),
                                         spacing="1",
                                     ),
-                                    width="20%"
+                                    width="15%"
                                 ),
                                 rx.box(
                                     rx.hstack(
@@ -350,7 +769,7 @@ def pacer() -> rx.Component:
                                         ),
                                         spacing="1",
                                     ),
-                                    width="20%"
+                                    width="15%"
                                 ),
                                 rx.box(
                                     rx.hstack(
@@ -363,7 +782,20 @@ def pacer() -> rx.Component:
                                         ),
                                         spacing="1",
                                     ),
-                                    width="15%"
+                                    width="13%"
+                                ),
+                                rx.box(
+                                    rx.hstack(
+                                        rx.text("Score", weight="bold", size="2"),
+                                        rx.button(
+                                            PacerPageState.sort_icon_opportunity_score,
+                                            variant="ghost",
+                                            size="1",
+                                            on_click=PacerPageState.sort_by_opportunity_score,
+                                        ),
+                                        spacing="1",
+                                    ),
+                                    width="10%"
                                 ),
                                 rx.box(
                                     rx.text("Delete", weight="bold", size="2"),
@@ -373,40 +805,26 @@ def pacer() -> rx.Component:
                                 border_bottom="2px solid #333",
                                 pb="2"
                             ),
-                            # Data rows
-                            rx.foreach(
-                                PacerPageState.rows,
-                                lambda case_data: rx.vstack(
-                                    rx.hstack(
-                                        rx.box(
-                                            rx.link(
-                                                case_data["case_title"],
-                                                href=case_data["case_link"],
-                                                target="_blank",
-                                                size="2"
-                                            ),
-                                            width="25%"
-                                        ),
-                                        rx.box(rx.text(case_data["court_id"], size="2"), width="20%"),
-                                        rx.box(rx.text(case_data["case_id"], size="2"), width="20%"),
-                                        rx.box(rx.text(case_data["case_number"], size="2"), width="20%"),
-                                        rx.box(rx.text(case_data["date_filed"], size="2"), width="15%"),
-                                        # Native checkbox that posts "court_id|case_id"
-                                        rx.box(
-                                            rx.el.input(
-                                                type="checkbox",
-                                                name=f"to_delete__{case_data['court_id']}__{case_data['case_id']}",
-                                                value="on",
-                                            ),
-                                            width="10%",
-                                        ),
+                            # Data rows: only the loaded window is rendered, absolutely
+                            # positioned inside a spacer sized for every matching case
+                            rx.el.div(
+                                rx.el.div(
+                                    rx.box(
+                                        rx.foreach(PacerPageState.rows, case_row),
+                                        position="absolute",
+                                        top=PacerPageState.window_offset,
                                         width="100%",
-                                        py="2"
                                     ),
-                                    rx.box(width="100%", height="1px", bg="#ddd"),
-                                    spacing="0",
-                                    width="100%"
-                                )
+                                    position="relative",
+                                    height=PacerPageState.grid_height,
+                                    width="100%",
+                                ),
+                                id=GRID_ID,
+                                on_scroll=rx.call_script(
+                                    f"document.getElementById('{GRID_ID}').scrollTop",
+                                    callback=PacerPageState.on_grid_scroll,
+                                ).throttle(100),
+                                style={"height": f"{VIEWPORT_HEIGHT_PX}px", "overflowY": "auto", "width": "100%"},
                             ),
                             spacing="0",
                         ),
@@ -423,8 +841,7 @@ def pacer() -> rx.Component:
                     ),
                 ),
             ),
-            on_submit=PacerPageState.delete_cases,
-            key=PacerPageState.form_nonce,  # force remount to clear checkboxes
+            width="100%",
         ),
 
         align="start",
@@ -1,5 +1,6 @@
 import reflex as rx 
-from db import get_user, get_all_users, add_user, update_user_permission, delete_user
+import metrics
+from db_async import get_user, get_all_users, add_user, update_user_permission, delete_user
 
 class State(rx.State):
     """The app state."""
@@ -20,13 +21,14 @@ class State(rx.State):
     
     edit_permission: dict[str, str] = {}
 
-    def on_mount(self):
+    async def on_mount(self):
         """Initialize state and load data."""
         self.show_users = False
-        self.load_users()
+        await self.load_users()
 
-    def on_login(self):
-        user = get_user(self.userid, self.password)
+    @metrics.timed("handler", handler="on_login")
+    async def on_login(self):
+        user = await get_user(self.userid, self.password)
         if user:
             self.permission = user["permission"]
             self.login_error = ""
@@ -34,9 +36,9 @@ class State(rx.State):
         else:
             self.login_error = "Invalid credentials"
             
-    def load_users(self):
+    async def load_users(self):
         try:
-            self.users = get_all_users()
+            self.users = await get_all_users()
             self.edit_permission = {user["username"]: user["permission"] for user in self.users}
             
             # Create the simplified display format
@@ -48,29 +50,29 @@ class State(rx.State):
             self.users_display = []
             self.show_users = False
 
-    def on_add_user(self):
+    async def on_add_user(self):
         try:
-            add_user(self.new_username, self.new_password, self.new_permission)
+            await add_user(self.new_username, self.new_password, self.new_permission)
             self.new_username = ""
             self.new_password = ""
             self.new_permission = "browse"
-            self.load_users()
+            await self.load_users()
         except Exception as e:
             print(f"Error adding user: {e}")
 
     def on_update_permission(self, username: str, permission: str):
         self.edit_permission[username] = permission
 
-    def on_save_permission(self, username: str):
+    async def on_save_permission(self, username: str):
         try:
-            update_user_permission(username, self.edit_permission[username])
-            self.load_users()
+            await update_user_permission(username, self.edit_permission[username])
+            await self.load_users()
         except Exception as e:
             print(f"Error saving permission: {e}")
 
-    def on_delete_user(self, username: str):
+    async def on_delete_user(self, username: str):
         try:
-            delete_user(username)
-            self.load_users()
+            await delete_user(username)
+            await self.load_users()
         except Exception as e:
             print(f"Error deleting user: {e}")
\ No newline at end of file
@@ -0,0 +1,200 @@
+# backfill.py — sharded PACER backfill over a wide date range
+#
+# The range is cut into --window-days windows per region and a pool of
+# --workers searches them in parallel (sharing one rate limiter). A window whose
+# first page reports more than --max-results cases is split in half and the
+# halves are queued instead, so no single query runs into the PCL result cap.
+# Every window is checkpointed in pacer_backfill_windows; re-running the same
+# command resumes the job and skips windows that already finished.
+#
+#   python backfill.py --from 2024-01-01 --to 2024-12-31
+#   python backfill.py --from 2024-01-01 --to 2024-12-31 --region "California Southern" --workers 8
+#   python backfill.py --from 2024-01-01 --to 2024-12-31 --status     # checkpoint summary only
+import argparse
+import asyncio
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pacer_api
+import scoring
+from db import fetch_all_regions, fetch_backfill_windows, save_backfill_window
+
+DEFAULT_WINDOW_DAYS = 30
+# Windows in these states are never searched again by a resumed job
+FINISHED = ("done", "split")
+
+Window = Tuple[str, date, date]  # (region, date_from, date_to), both dates inclusive
+
+
+def plan_windows(date_from: date, date_to: date, window_days: int) -> List[Tuple[date, date]]:
+    windows = []
+    start = date_from
+    step = timedelta(days=max(1, window_days))
+    while start <= date_to:
+        end = min(date_to, start + step - timedelta(days=1))
+        windows.append((start, end))
+        start = end + timedelta(days=1)
+    return windows
+
+
+def split_window(date_from: date, date_to: date) -> Optional[Tuple[Tuple[date, date], Tuple[date, date]]]:
+    """Halve a window; None when it is a single day and cannot shrink further."""
+    if date_to <= date_from:
+        return None
+    mid = date_from + (date_to - date_from) // 2
+    return (date_from, mid), (mid + timedelta(days=1), date_to)
+
+
+def job_name(date_from: date, date_to: date, window_days: int) -> str:
+    return f"{date_from.isoformat()}..{date_to.isoformat()}/{window_days}d"
+
+
+def pending_windows(job: str, regions: List[str], date_from: date, date_to: date,
+                    window_days: int) -> List[Window]:
+    """Planned + checkpointed windows that still need a search (new ones are recorded as pending)."""
+    checkpoints = {(r["region"], r["date_from"], r["date_to"]): r["status"] for r in fetch_backfill_windows(job)}
+    todo: List[Window] = []
+    for region in regions:
+        for df, dt in plan_windows(date_from, date_to, window_days):
+            status = checkpoints.get((region, df, dt))
+            if status is None:
+                save_backfill_window(job, region, df, dt, "pending")
+                todo.append((region, df, dt))
+            elif status not in FINISHED:
+                todo.append((region, df, dt))
+    # Halves of windows that were split before the crash
+    planned = set(todo)
+    for (region, df, dt), status in checkpoints.items():
+        if region in regions and status not in FINISHED and (region, df, dt) not in planned:
+            todo.append((region, df, dt))
+    return todo
+
+
+async def run_backfill(job: str, regions: List[str], date_from: date, date_to: date,
+                       window_days: int = DEFAULT_WINDOW_DAYS,
+                       workers: int = pacer_api.MAX_CONCURRENT_SEARCHES,
+                       max_results: int = pacer_api.BATCH_MAX_RESULTS) -> Dict[str, Any]:
+    totals = {"windows": 0, "split": 0, "failed": 0, "fetched": 0, "inserted": 0, "updated": 0,
+              "unchanged": 0}
+    token = await asyncio.to_thread(pacer_api.get_token, pacer_api.ENV)
+    if not token:
+        print("❌ Backfill aborted: authentication failed.")
+        return totals
+    api_root = pacer_api.env_cfg(pacer_api.ENV)["PCL_API_ROOT"]
+    limiter = pacer_api.HostRateLimiter(pacer_api.PER_HOST_RATE_LIMIT)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for window in await asyncio.to_thread(pending_windows, job, regions, date_from, date_to, window_days):
+        queue.put_nowait(window)
+    print(f"🗂️ Backfill {job}: {queue.qsize()} window(s) to search across {len(regions)} region(s).")
+
+    async def search_window(region: str, df: date, dt: date) -> None:
+        await asyncio.to_thread(save_backfill_window, job, region, df, dt, "running")
+        halves = split_window(df, dt)
+        fetched = 0
+        try:
+            async for cases in pacer_api.aiter_cases_by_date(
+                token, api_root, df.isoformat(), dt.isoformat(), region, limiter,
+                max_results=max_results if halves else None, strict=True,
+            ):
+                counts = await asyncio.to_thread(pacer_api.upsert_pacer_cases, cases)
+                fetched += len(cases)
+                totals["fetched"] += len(cases)
+                totals["inserted"] += counts["inserted"]
+                totals["updated"] += counts["updated"]
+                totals["unchanged"] += counts["unchanged"]
+        except pacer_api.ResultCapExceeded as e:
+            print(f"✂️ {region} {df}..{dt}: {e}; splitting.")
+            for half_from, half_to in halves:
+                await asyncio.to_thread(save_backfill_window, job, region, half_from, half_to, "pending")
+                queue.put_nowait((region, half_from, half_to))
+            await asyncio.to_thread(save_backfill_window, job, region, df, dt, "split")
+            totals["split"] += 1
+            return
+        except Exception as e:
+            print(f"❌ {region} {df}..{dt}: {type(e).__name__}: {e}")
+            await asyncio.to_thread(save_backfill_window, job, region, df, dt, "failed", fetched,
+                                    f"{type(e).__name__}: {e}")
+            totals["failed"] += 1
+            return
+        await asyncio.to_thread(save_backfill_window, job, region, df, dt, "done", fetched)
+        totals["windows"] += 1
+
+    async def worker() -> None:
+        while True:
+            region, df, dt = await queue.get()
+            try:
+                await search_window(region, df, dt)
+            except Exception as e:
+                # Checkpoint writes can fail too (DB down); a dead worker would
+                # leave queue.join() waiting forever, so log and keep going
+                print(f"❌ {region} {df}..{dt}: {type(e).__name__}: {e}")
+                totals["failed"] += 1
+                try:
+                    await asyncio.to_thread(save_backfill_window, job, region, df, dt, "failed",
+                                            error=f"{type(e).__name__}: {e}")
+                except Exception as save_error:
+                    print(f"⚠️ Could not checkpoint {region} {df}..{dt}: {save_error}")
+            finally:
+                queue.task_done()
+
+    tasks = [asyncio.create_task(worker()) for _ in range(max(1, workers))]
+    try:
+        # Splits enqueue more work, so wait for the queue rather than the workers
+        await queue.join()
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await pacer_api.aclose_http_clients()
+    return totals
+
+
+def print_status(job: str) -> None:
+    rows = fetch_backfill_windows(job)
+    if not rows:
+        print(f"No checkpoints for {job}.")
+        return
+    by_status: Dict[str, int] = {}
+    for r in rows:
+        by_status[r["status"]] = by_status.get(r["status"], 0) + 1
+    cases = sum(r["cases"] or 0 for r in rows if r["status"] == "done")
+    print(f"{job}: " + ", ".join(f"{k}={v}" for k, v in sorted(by_status.items())) + f", cases={cases}")
+    for r in rows:
+        if r["status"] == "failed":
+            print(f"  ❌ {r['region']} {r['date_from']}..{r['date_to']} (attempts={r['attempts']}): {r['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded, resumable PACER backfill over a date range.")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, required=True)
+    # Required rather than defaulting to today: the end date is part of the job
+    # name, so a moving default would start a new job (and re-search) every day
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, required=True)
+    parser.add_argument("--region", action="append", help="region name (repeatable); default: every region")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS, help="initial window width")
+    parser.add_argument("--workers", type=int, default=pacer_api.MAX_CONCURRENT_SEARCHES)
+    parser.add_argument("--max-results", type=int, default=pacer_api.BATCH_MAX_RESULTS,
+                        help="split windows whose search reports more cases than this")
+    parser.add_argument("--job", help="checkpoint name (default: derived from the range and window size)")
+    parser.add_argument("--status", action="store_true", help="print the job's checkpoint summary and exit")
+    args = parser.parse_args()
+
+    job = args.job or job_name(args.date_from, args.date_to, args.window_days)
+    if args.status:
+        print_status(job)
+        return
+
+    regions = args.region or [r["region_name"] for r in fetch_all_regions()]
+    totals = asyncio.run(run_backfill(job, regions, args.date_from, args.date_to,
+                                      args.window_days, args.workers, args.max_results))
+    print(f"💾 Backfill {job}: windows={totals['windows']} split={totals['split']} failed={totals['failed']} "
+          f"fetched={totals['fetched']} inserted={totals['inserted']} updated={totals['updated']} "
+          f"unchanged={totals['unchanged']}")
+    scored = scoring.score_pending()
+    print(f"🎯 Scored {scored['scored']} new/changed case(s).")
+    print_status(job)
+
+
+if __name__ == "__main__":
+    main()
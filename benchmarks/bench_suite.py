@@ -0,0 +1,176 @@
+# bench_suite.py — hot-path benchmarks: ingestion, grid loading and sorting
+#
+#   python benchmarks/bench_suite.py                          # 1k, 10k, 100k rows
+#   python benchmarks/bench_suite.py --sizes 5000 50000 --repeat 30
+#   python benchmarks/bench_suite.py --json results.json      # save for later runs
+#   python benchmarks/bench_suite.py --baseline results.json  # exit 1 on a p50 regression
+#
+# For each size the suite seeds pacer_cases with synthetic rows (see
+# bench_upsert.synthetic_cases) and measures
+#   upsert          pacer_api.upsert_pacer_cases, one call per UPSERT_CHUNK_SIZE rows
+#   upsert_same     the same chunks again; every row is skipped as unchanged
+#   fetch_all       db.fetch_all_cases()
+#   load_grid_data  PacerPageState.load_grid_data (count + first window)
+#   sort_data       PacerPageState.sort_data, cycling through every sortable column
+# reporting throughput, p50/p99 latency and peak Python memory (tracemalloc,
+# measured on a separate pass so it does not skew the timings).
+#
+# Point DATABASE_URL at a local/dev Postgres. Synthetic rows are removed after
+# each size; any real cases already in the table are included in the reads.
+# cache.py is switched off for the run so the reads always reach Postgres.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import cache  # noqa: E402
+from bench_upsert import cleanup, synthetic_cases  # noqa: E402
+from db import SORTABLE_CASE_COLUMNS, close_async_pool, fetch_all_cases  # noqa: E402
+from pacer_api import UPSERT_CHUNK_SIZE, chunked, upsert_pacer_cases  # noqa: E402
+
+# Measure the database path: with the read-through cache on, every grid call
+# after the first would be served from memory and --baseline would compare nothing
+cache.CACHE_TTL = 0
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 20
+# A baseline p50 this much slower counts as a regression
+REGRESSION_TOLERANCE = 0.20
+
+# The grid handlers are coroutines on the async pool, which is bound to the
+# loop it was opened on, so every call runs on this one loop
+_loop = asyncio.new_event_loop()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def grid_state():
+    # Imported lazily: building the Reflex state class is slow and only the
+    # grid benchmarks need it
+    from COP.pacer import PacerPageState
+
+    state = PacerPageState(_reflex_internal_init=True)
+    handlers = {
+        name: lambda *args, fn=PacerPageState.event_handlers[name].fn: _loop.run_until_complete(fn(*args))
+        for name in ("load_grid_data", "sort_data")
+    }
+    return state, handlers
+
+
+def measure(fn, calls: int, items_per_call) -> dict:
+    """Time `calls` invocations of fn(i), then rerun once under tracemalloc for peak memory."""
+    timings = []
+    items = 0
+    for i in range(calls):
+        t0 = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - t0) * 1000)
+        items += items_per_call(i)
+
+    tracemalloc.start()
+    try:
+        fn(0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total_s = sum(timings) / 1000
+    return {
+        "calls": calls,
+        "throughput": items / total_s if total_s else 0.0,
+        "p50_ms": percentile(timings, 50),
+        "p99_ms": percentile(timings, 99),
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def bench_size(n: int, repeat: int) -> dict:
+    results = {}
+    cases = synthetic_cases(n)
+    chunks = list(chunked(cases, UPSERT_CHUNK_SIZE))
+
+    # Ingestion: cold pass inserts, the tracemalloc rerun of chunk 0 is an update
+    results["upsert"] = measure(lambda i: upsert_pacer_cases(chunks[i]), len(chunks),
+                                lambda i: len(chunks[i]))
+    results["upsert_same"] = measure(lambda i: upsert_pacer_cases(chunks[i]), len(chunks),
+                                     lambda i: len(chunks[i]))
+
+    results["fetch_all"] = measure(lambda i: fetch_all_cases(), repeat, lambda i: n)
+
+    state, handlers = grid_state()
+    results["load_grid_data"] = measure(lambda i: handlers["load_grid_data"](state), repeat,
+                                        lambda i: len(state.rows))
+
+    def sort(i):
+        handlers["sort_data"](state, SORTABLE_CASE_COLUMNS[i % len(SORTABLE_CASE_COLUMNS)])
+
+    results["sort_data"] = measure(sort, repeat, lambda i: len(state.rows))
+    return results
+
+
+def report(n: int, results: dict) -> None:
+    print(f"\n== {n:,} rows ==")
+    print(f"{'path':<16}{'calls':>7}{'rows/s':>14}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for path, r in results.items():
+        print(f"{path:<16}{r['calls']:>7}{r['throughput']:>14,.0f}{r['p50_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['peak_mb']:>10.2f}")
+
+
+def regressions(current: dict, baseline: dict) -> list[str]:
+    found = []
+    for size, paths in current.items():
+        for path, r in paths.items():
+            base = baseline.get(size, {}).get(path)
+            if base and base["p50_ms"] and r["p50_ms"] > base["p50_ms"] * (1 + REGRESSION_TOLERANCE):
+                found.append(f"{path} @ {size} rows: p50 {base['p50_ms']:.2f}ms → {r['p50_ms']:.2f}ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, grid loading and sorting.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="calls per read path")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare p50s against a previous --json file")
+    args = parser.parse_args()
+
+    all_results = {}
+    cleanup()
+    try:
+        for n in args.sizes:
+            all_results[str(n)] = bench_size(n, args.repeat)
+            report(n, all_results[str(n)])
+            cleanup()
+    finally:
+        cleanup()
+        _loop.run_until_complete(close_async_pool())
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(all_results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(all_results, json.load(f))
+        for line in found:
+            print(f"❌ Regression: {line}")
+        if found:
+            sys.exit(1)
+        print("✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
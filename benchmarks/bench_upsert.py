@@ -0,0 +1,63 @@
+# bench_upsert.py — rows/sec of pacer_api.upsert_pacer_cases against DATABASE_URL
+#
+#   python benchmarks/bench_upsert.py                 # 1k, 10k, 100k
+#   python benchmarks/bench_upsert.py 5000 50000      # custom sizes
+#
+# Each size runs three passes: a cold pass (all inserts), a warm pass (all
+# updates) and a repeat of the warm pass (all unchanged, so nothing is written).
+# Synthetic rows use case_ids from SYNTHETIC_BASE upwards and are deleted at the end,
+# so this is safe to point at a dev database that already holds real cases.
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache  # noqa: E402
+from db import get_conn  # noqa: E402
+from pacer_api import upsert_pacer_cases  # noqa: E402
+
+SYNTHETIC_BASE = 9_000_000_000
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def synthetic_cases(n: int, title_suffix: str = "") -> list[dict]:
+    return [
+        {
+            "courtId": ("casdc", "nysdc", "txsdc", "ilndc")[i % 4],
+            "caseId": SYNTHETIC_BASE + i,
+            "caseNumber": f"3:24-cr-{i:06d}",
+            "caseType": "cr",
+            "caseTitle": f"USA v. Defendant {i}{title_suffix}",
+            "dateFiled": f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}",
+            "jurisdictionType": "cr",
+            "caseLink": f"https://ecf.casd.uscourts.gov/cgi-bin/iqquerymenu.pl?{SYNTHETIC_BASE + i}",
+        }
+        for i in range(n)
+    ]
+
+
+def cleanup() -> None:
+    with get_conn() as c:
+        c.execute("DELETE FROM pacer_cases WHERE case_id >= %s", (SYNTHETIC_BASE,))
+    cache.invalidate("cases")
+
+
+def run(n: int) -> None:
+    for label, suffix in (("insert", ""), ("update", " (amended)"), ("same", " (amended)")):
+        cases = synthetic_cases(n, suffix)
+        t0 = time.perf_counter()
+        counts = upsert_pacer_cases(cases)
+        dt = time.perf_counter() - t0
+        print(f"{n:>8} rows  {label:<6}  {dt:8.3f}s  {n / dt:>10,.0f} rows/s  {counts}")
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or list(DEFAULT_SIZES)
+    cleanup()
+    try:
+        for n in sizes:
+            run(n)
+            cleanup()
+    finally:
+        cleanup()
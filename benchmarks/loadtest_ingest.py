@@ -0,0 +1,111 @@
+# loadtest_ingest.py — end-to-end ingestion throughput against the local PACER mock
+#
+#   python benchmarks/loadtest_ingest.py --days 30 --cases-per-day 20 --latency-ms 200 --rate-429 0.05
+#   python benchmarks/loadtest_ingest.py --url http://127.0.0.1:8765     # mock already running
+#
+# Runs the same pipeline as PacerPageState.load_more_cases (cached token ->
+# concurrent region search -> per-page bulk upsert) over the regions in the
+# `regions` table (or --region), with the search-ledger cache disabled so every
+# page is a live call. Needs DATABASE_URL; mock cases use case_ids from
+# MOCK_CASE_ID_BASE and are removed again unless --keep is given.
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mock_pacer  # noqa: E402
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def ingest(pacer_api, regions: list[str], date_from: str, date_to: str, concurrency: int) -> dict:
+    t0 = time.perf_counter()
+    token = await asyncio.to_thread(pacer_api.get_token, "MOCK")
+    cfg = pacer_api.env_cfg("MOCK")
+    pages = cases = inserted = updated = unchanged = 0
+    upsert_ms: list[float] = []
+    async for _region, page_cases in pacer_api.search_regions_concurrently(
+        token, cfg["PCL_API_ROOT"], date_from, date_to, regions, max_concurrency=concurrency
+    ):
+        u0 = time.perf_counter()
+        counts = await asyncio.to_thread(pacer_api.upsert_pacer_cases, page_cases)
+        upsert_ms.append((time.perf_counter() - u0) * 1000)
+        pages += 1
+        cases += len(page_cases)
+        inserted += counts["inserted"]
+        updated += counts["updated"]
+        unchanged += counts["unchanged"]
+    await pacer_api.aclose_http_clients()
+    return {
+        "elapsed_s": time.perf_counter() - t0, "pages": pages, "cases": cases,
+        "inserted": inserted, "updated": updated, "unchanged": unchanged, "upsert_ms": upsert_ms,
+    }
+
+
+async def main(args) -> None:
+    os.environ["PACER_ENV"] = "MOCK"
+    if args.url:
+        os.environ["PACER_MOCK_URL"] = args.url
+    else:
+        os.environ["PACER_MOCK_URL"] = f"http://127.0.0.1:{args.port}"
+    import pacer_api  # after PACER_ENV/PACER_MOCK_URL are set
+    import cache
+    from db import fetch_all_regions, get_conn
+
+    pacer_api.SEARCH_CACHE_TTL = 0
+
+    runner = mock = None
+    if not args.url:
+        runner, mock = await mock_pacer.start_mock(port=args.port, **mock_pacer.mock_options(args))
+
+    regions = args.region or [r["region_name"] for r in fetch_all_regions()] or [None]
+    today = date.today()
+    date_from = (today - timedelta(days=args.days)).isoformat()
+    date_to = today.isoformat()
+
+    try:
+        for run in range(1, args.runs + 1):
+            res = await ingest(pacer_api, regions, date_from, date_to, args.concurrency)
+            rate = res["cases"] / res["elapsed_s"] if res["elapsed_s"] else 0.0
+            print(
+                f"run {run}: {len(regions)} region(s) {date_from}..{date_to}  "
+                f"pages={res['pages']} cases={res['cases']} (new={res['inserted']} upd={res['updated']} same={res['unchanged']})  "
+                f"{res['elapsed_s']:.2f}s  {rate:,.0f} cases/s  "
+                f"upsert p50={percentile(res['upsert_ms'], 50):.1f}ms p99={percentile(res['upsert_ms'], 99):.1f}ms"
+                + (f" mean={statistics.mean(res['upsert_ms']):.1f}ms" if res["upsert_ms"] else "")
+            )
+        print("http retries:", pacer_api.RETRY_STATS)
+        if mock:
+            print("mock stats:  ", mock.stats)
+    finally:
+        if runner:
+            await runner.cleanup()
+        if not args.keep:
+            with get_conn() as c:
+                c.execute("DELETE FROM pacer_cases WHERE case_id >= %s", (mock_pacer.MOCK_CASE_ID_BASE,))
+            cache.invalidate("cases")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingestion load test against the local PACER mock.")
+    parser.add_argument("--url", help="use an already running mock instead of starting one")
+    parser.add_argument("--region", action="append", help="region name (repeatable); default: all regions")
+    parser.add_argument("--days", type=int, default=7, help="width of the searched date range")
+    parser.add_argument("--runs", type=int, default=2, help="repeat runs (later runs measure the update path)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--keep", action="store_true", help="keep the mock cases in pacer_cases")
+    parser.add_argument("--port", type=int, default=8765, help="port for the in-process mock")
+    mock_pacer.add_mock_arguments(parser)
+    asyncio.run(main(parser.parse_args()))
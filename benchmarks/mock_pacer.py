@@ -0,0 +1,218 @@
+# mock_pacer.py — local stand-in for the PACER CSO auth service, PCL /cases/find
+# and the ECF qrySummary/qryParties/qryAttorneys pages
+#
+#   python benchmarks/mock_pacer.py --port 8765 --latency-ms 150 --error-rate 0.02 --rate-429 0.05
+#   PACER_ENV=MOCK python pacer_api.py          # point the app/CLI at it
+#
+# Results are deterministic per (court, filing date): each court files
+# --cases-per-day criminal cases every day, paged --page-size at a time with a
+# PCL-style receipt and pageInfo. Tokens expire after --token-ttl seconds so
+# the 401 re-login path gets exercised too. ECF pages are served under
+# /ecf/<court>/cgi-bin/<script>?<caseId> and are likewise stable per case id.
+import argparse
+import asyncio
+import random
+import secrets
+import time
+from datetime import date, timedelta
+
+from aiohttp import web
+
+DEFAULT_COURTS = ("casdc", "cacdc", "nysdc", "nyedc", "txsdc", "ilndc", "flsdc", "dcdc")
+MOCK_CASE_ID_BASE = 8_000_000_000
+FEE_PER_PAGE = 0.10
+
+
+class MockPacer:
+    def __init__(self, latency_ms: float = 100.0, jitter_ms: float = 50.0, error_rate: float = 0.0,
+                 rate_429: float = 0.0, page_size: int = 54, cases_per_day: int = 5,
+                 token_ttl: float = 3600.0, courts=DEFAULT_COURTS, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.page_size = page_size
+        self.cases_per_day = cases_per_day
+        self.token_ttl = token_ttl
+        self.courts = tuple(courts)
+        self.rng = random.Random(seed)
+        self.tokens: dict[str, float] = {}
+        self.stats = {"auth": 0, "searches": 0, "ecf_pages": 0, "errors_500": 0, "errors_429": 0, "errors_401": 0}
+
+    async def _latency(self) -> None:
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _case(self, court: str, day: date, n: int) -> dict:
+        ordinal = (day.toordinal() - date(2000, 1, 1).toordinal()) * 1000 + n
+        court_no = self.courts.index(court) if court in self.courts else 0
+        case_id = MOCK_CASE_ID_BASE + court_no * 100_000_000 + ordinal
+        number = f"{day.year % 100:02d}-cr-{ordinal % 100000:05d}"
+        return {
+            "courtId": court,
+            "caseId": case_id,
+            "caseNumber": number,
+            "caseType": "cr",
+            "caseTitle": f"USA v. Defendant {court.upper()}-{ordinal}",
+            "dateFiled": day.isoformat(),
+            "jurisdictionType": "cr",
+            "caseLink": f"https://ecf.{court}.uscourts.gov/cgi-bin/iqquerymenu.pl?{case_id}",
+        }
+
+    def _cases(self, courts, date_from: date, date_to: date):
+        # Lazily enumerate matching cases in a stable order (court, date, n)
+        for court in courts:
+            day = date_from
+            while day <= date_to:
+                for n in range(self.cases_per_day):
+                    yield self._case(court, day, n)
+                day += timedelta(days=1)
+
+    async def auth(self, request: web.Request) -> web.Response:
+        await self._latency()
+        self.stats["auth"] += 1
+        token = secrets.token_hex(16)
+        self.tokens[token] = time.time() + self.token_ttl
+        return web.json_response({"loginResult": "0", "nextGenCSO": token})
+
+    async def find(self, request: web.Request) -> web.Response:
+        await self._latency()
+        expires = self.tokens.get(request.headers.get("X-NEXT-GEN-CSO", ""))
+        if not expires or expires < time.time():
+            self.stats["errors_401"] += 1
+            return web.json_response({"error": "invalid token"}, status=401)
+        roll = self.rng.random()
+        if roll < self.rate_429:
+            self.stats["errors_429"] += 1
+            return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "1"})
+        if roll < self.rate_429 + self.error_rate:
+            self.stats["errors_500"] += 1
+            return web.json_response({"error": "internal"}, status=500)
+
+        self.stats["searches"] += 1
+        body = await request.json()
+        page = int(request.query.get("page", "0"))
+        today = date.today()
+        date_from = date.fromisoformat((body.get("dateFiledFrom") or (today - timedelta(days=1)).isoformat())[:10])
+        date_to = date.fromisoformat((body.get("dateFiledTo") or today.isoformat())[:10])
+        courts = body.get("courtId") or list(self.courts)
+
+        days = max(0, (date_to - date_from).days + 1)
+        total = len(courts) * days * self.cases_per_day
+        total_pages = max(1, -(-total // self.page_size))
+        start = page * self.page_size
+        content = []
+        for i, case in enumerate(self._cases(courts, date_from, date_to)):
+            if i >= start + self.page_size:
+                break
+            if i >= start:
+                content.append(case)
+
+        return web.json_response({
+            "receipt": {"searchFee": f"{FEE_PER_PAGE:.2f}", "billablePages": 1},
+            "pageInfo": {
+                "number": page,
+                "size": self.page_size,
+                "totalPages": total_pages,
+                "totalElements": total,
+                "numberOfElements": len(content),
+                "first": page == 0,
+                "last": page >= total_pages - 1,
+            },
+            "content": content,
+        })
+
+    def _ecf_parties(self, case_id: int) -> str:
+        n = case_id % 1000
+        rows = [
+            "<tr><td><b>Defendant (1)</b></td></tr>",
+            f"<tr><td><b>Defendant {n}</b><br>also known as<br>Def {n}</td>"
+            f"<td>represented by</td><td><b>Counsel {n}</b><br>Federal Defenders<br>225 Broadway<br>"
+            f"San Diego, CA 92101<br>(619) 234-{n:04d}<br>Email: counsel{n}@example.com<br>"
+            "<i>LEAD ATTORNEY</i><br><i>Designation: Public Defender or Community Defender Appointment</i></td></tr>",
+            "<tr><td><b>Pending Counts</b></td><td><b>Disposition</b></td></tr>",
+            f"<tr><td>21:952 and 960 - Importation of Controlled Substance ({1 + n % 3})</td><td></td></tr>",
+            "<tr><td><b>Highest Offense Level (Opening)</b></td></tr><tr><td>Felony</td></tr>",
+            "<tr><td><b>Plaintiff</b></td></tr>",
+            "<tr><td><b>USA</b></td><td>represented by</td><td><b>U S Attorney CR</b><br>U S Attorneys Office<br>"
+            "<i>LEAD ATTORNEY</i><br><i>ATTORNEY TO BE NOTICED</i></td></tr>",
+        ]
+        return "<html><body><table>" + "".join(rows) + "</table></body></html>"
+
+    def _ecf_summary(self, case_id: int) -> str:
+        n = case_id % 1000
+        return ("<html><body><center><h3>Case Summary</h3></center><table>"
+                f"<tr><td>Presiding: Judge {n % 7}</td><td>Referral: Magistrate {n % 5}</td></tr>"
+                "<tr><td>Case Type: cr</td><td>Office: San Diego</td></tr>"
+                "<tr><td><b>Pending Counts</b></td><td><b>Disposition</b></td></tr>"
+                f"<tr><td>8:1324 - Bringing In and Harboring Certain Aliens ({1 + n % 2})</td><td></td></tr>"
+                "</table></body></html>")
+
+    async def ecf(self, request: web.Request) -> web.Response:
+        await self._latency()
+        expires = self.tokens.get(request.cookies.get("NextGenCSO", ""))
+        if not expires or expires < time.time():
+            self.stats["errors_401"] += 1
+            return web.Response(text="login required", status=401)
+        self.stats["ecf_pages"] += 1
+        try:
+            case_id = int(request.query_string)
+        except ValueError:
+            return web.Response(text="bad case id", status=404)
+        script = request.match_info["script"]
+        if script == "qrySummary.pl":
+            html = self._ecf_summary(case_id)
+        elif script in ("qryParties.pl", "qryAttorneys.pl"):
+            html = self._ecf_parties(case_id)
+        else:
+            return web.Response(text="unknown report", status=404)
+        return web.Response(text=html, content_type="text/html")
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/services/cso-auth", self.auth)
+        app.router.add_post("/pcl-public-api/rest/cases/find", self.find)
+        app.router.add_get("/ecf/{court}/cgi-bin/{script}", self.ecf)
+        return app
+
+
+async def start_mock(host: str = "127.0.0.1", port: int = 8765, **options) -> tuple[web.AppRunner, MockPacer]:
+    """Start the mock in the running event loop; `await runner.cleanup()` to stop it."""
+    mock = MockPacer(**options)
+    runner = web.AppRunner(mock.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner, mock
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of searches answered with 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of searches answered with 429")
+    parser.add_argument("--page-size", type=int, default=54)
+    parser.add_argument("--cases-per-day", type=int, default=5, help="cases filed per court per day")
+    parser.add_argument("--token-ttl", type=float, default=3600.0)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local PACER PCL API stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_mock_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def mock_options(args) -> dict:
+    return {
+        "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+        "rate_429": args.rate_429, "page_size": args.page_size, "cases_per_day": args.cases_per_day,
+        "token_ttl": args.token_ttl,
+    }
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"🧪 Mock PACER on http://{args.host}:{args.port} (set PACER_ENV=MOCK)")
+    web.run_app(MockPacer(**mock_options(args)).app(), host=args.host, port=args.port, access_log=None)
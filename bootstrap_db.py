@@ -0,0 +1,54 @@
+# bootstrap_db.py — create/upgrade the COP schema via the Alembic migrations
+#
+#   python bootstrap_db.py                          # upgrade DATABASE_URL to head
+#   python bootstrap_db.py --admin alice s3cret     # ...and make sure an admin user exists
+#   python bootstrap_db.py --sql > schema.sql       # print the SQL instead of running it
+#
+# Safe on the existing Supabase database: every migration uses IF NOT EXISTS,
+# so the first run only adds what is missing and stamps the version.
+import argparse
+import os
+
+from alembic import command
+from alembic.config import Config
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def alembic_config() -> Config:
+    return Config(os.path.join(ROOT, "alembic.ini"))
+
+
+def upgrade(revision: str = "head", sql: bool = False) -> None:
+    command.upgrade(alembic_config(), revision, sql=sql)
+
+
+def ensure_admin(username: str, password: str) -> None:
+    from psycopg import errors as pg_errors
+    from db import add_user, update_user_permission
+
+    try:
+        add_user(username, password, "admin")
+        print(f"👤 Created admin user {username!r}.")
+    except pg_errors.UniqueViolation:
+        update_user_permission(username, "admin")
+        print(f"👤 User {username!r} already exists; permission set to admin.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or upgrade the COP database schema.")
+    parser.add_argument("--revision", default="head", help="target migration (default: head)")
+    parser.add_argument("--sql", action="store_true", help="print the migration SQL instead of running it")
+    parser.add_argument("--admin", nargs=2, metavar=("USERNAME", "PASSWORD"), help="ensure an admin login exists")
+    args = parser.parse_args()
+
+    upgrade(args.revision, sql=args.sql)
+    if args.sql:
+        return
+    print(f"✅ Schema at {args.revision}.")
+    if args.admin:
+        ensure_admin(*args.admin)
+
+
+if __name__ == "__main__":
+    main()
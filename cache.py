@@ -0,0 +1,293 @@
+# cache.py — shared read-through cache for rarely-changing reads (cases, regions, users)
+#
+#   rows = cache.get_or_load("regions", "all", load)              # sync callers (db.py)
+#   rows = await cache.aget_or_load("cases", key, aload)          # event-loop callers (db_async.py)
+#   cache.invalidate("regions")                                   # from the write helpers
+#
+# With REDIS_URL set, entries live in Redis so every Reflex worker and sync job
+# shares them; without it (or while Redis is unreachable) each process keeps its
+# own copy. Every key carries its namespace's version number: invalidate() bumps
+# the version, which orphans all of the namespace's entries at once without
+# scanning or deleting (they simply expire). CACHE_TTL bounds how stale an entry
+# can get when a write bypasses the helpers in db.py / db_async.py; CACHE_TTL=0
+# turns the cache off (every call goes to the loader).
+#
+# Values are stored as JSON (dates/datetimes/Decimals tagged and restored), never
+# pickled: anyone able to write to a shared Redis could otherwise run code here.
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import metrics
+
+try:
+    import redis
+    import redis.asyncio as aredis
+except ImportError:  # optional: without it the cache is per process
+    redis = aredis = None
+
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHE_TTL = int(os.environ.get("CACHE_TTL", "300"))              # seconds
+CACHE_LOCAL_MAX_ENTRIES = int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", "1024"))
+# Bump when the shape of cached values changes so old entries are never read
+CACHE_PREFIX = "cop:cache:v2"
+# After a Redis error, use the local cache for this long before trying again
+REDIS_RETRY_AFTER = 30.0
+
+_lock = threading.Lock()
+_local: "OrderedDict[str, tuple[float, str]]" = OrderedDict()   # key -> (expires_at, encoded value)
+_local_versions: Dict[str, int] = {}
+_redis = None
+_aredis = None
+_redis_down_until = 0.0
+
+
+def _encode_default(o: Any) -> Any:
+    if isinstance(o, datetime):
+        return {"__datetime__": o.isoformat()}
+    if isinstance(o, date):
+        return {"__date__": o.isoformat()}
+    if isinstance(o, Decimal):
+        return {"__decimal__": str(o)}
+    raise TypeError(f"cannot cache a {type(o).__name__}")
+
+
+def _decode_hook(d: Dict[str, Any]) -> Any:
+    if len(d) == 1:
+        if "__datetime__" in d:
+            return datetime.fromisoformat(d["__datetime__"])
+        if "__date__" in d:
+            return date.fromisoformat(d["__date__"])
+        if "__decimal__" in d:
+            return Decimal(d["__decimal__"])
+    return d
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode_default, separators=(",", ":"))
+
+
+def _loads(blob: Any) -> Any:
+    return json.loads(blob, object_hook=_decode_hook)
+
+
+def _version_key(namespace: str) -> str:
+    return f"{CACHE_PREFIX}:ver:{namespace}"
+
+
+def _entry_key(namespace: str, version: int, key: Hashable) -> str:
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{namespace}:{version}:{digest}"
+
+
+def _redis_usable() -> bool:
+    return bool(REDIS_URL) and redis is not None and time.monotonic() >= _redis_down_until
+
+
+def _redis_failed(e: Exception) -> None:
+    global _redis_down_until
+    _redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+    print(f"⚠️ Redis cache unavailable, using the in-process cache for {REDIS_RETRY_AFTER:.0f}s: {e}")
+
+
+def _sync_client():
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis.from_url(REDIS_URL, socket_timeout=1.0, socket_connect_timeout=1.0)
+    return _redis
+
+
+def _async_client():
+    global _aredis
+    if _aredis is None:
+        _aredis = aredis.Redis.from_url(REDIS_URL, socket_timeout=1.0, socket_connect_timeout=1.0)
+    return _aredis
+
+
+# ---------- in-process store ----------
+def _local_key(namespace: str, key: Hashable) -> str:
+    """Entry key under the namespace's current version; taken before loading so
+    a value loaded across an invalidate() is stored under the old version."""
+    with _lock:
+        return _entry_key(namespace, _local_versions.get(namespace, 0), key)
+
+
+def _local_get(k: str) -> Optional[str]:
+    with _lock:
+        entry = _local.get(k)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _local[k]
+            return None
+        _local.move_to_end(k)
+        return entry[1]
+
+
+def _local_set(k: str, blob: str, ttl: float) -> None:
+    with _lock:
+        _local[k] = (time.monotonic() + ttl, blob)
+        _local.move_to_end(k)
+        while len(_local) > CACHE_LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
+
+
+def _local_invalidate(namespaces) -> None:
+    with _lock:
+        for ns in namespaces:
+            _local_versions[ns] = _local_versions.get(ns, 0) + 1
+
+
+def _record(namespace: str, hit: bool) -> None:
+    metrics.inc("cache_requests_total", namespace=namespace, result="hit" if hit else "miss")
+
+
+# ---------- public API ----------
+def get_or_load(namespace: str, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+    """Cached value for (namespace, key), calling loader() and storing its result on a miss."""
+    ttl = CACHE_TTL if ttl is None else ttl
+    if ttl <= 0:
+        return loader()
+    if _redis_usable():
+        try:
+            client = _sync_client()
+            k = _entry_key(namespace, int(client.get(_version_key(namespace)) or 0), key)
+            blob = client.get(k)
+        except redis.RedisError as e:
+            _redis_failed(e)
+        else:
+            _record(namespace, blob is not None)
+            if blob is not None:
+                return _loads(blob)
+            value = loader()
+            try:
+                client.set(k, _dumps(value), ex=max(1, int(ttl)))
+            except redis.RedisError as e:
+                _redis_failed(e)
+            return value
+
+    k = _local_key(namespace, key)
+    blob = _local_get(k)
+    _record(namespace, blob is not None)
+    if blob is not None:
+        return _loads(blob)
+    value = loader()
+    _local_set(k, _dumps(value), ttl)
+    return value
+
+
+async def aget_or_load(namespace: str, key: Hashable, loader: Callable[[], Awaitable[Any]],
+                       ttl: Optional[float] = None) -> Any:
+    """Async twin of get_or_load (redis.asyncio, so a cache round trip never blocks the loop)."""
+    ttl = CACHE_TTL if ttl is None else ttl
+    if ttl <= 0:
+        return await loader()
+    if _redis_usable():
+        try:
+            client = _async_client()
+            k = _entry_key(namespace, int(await client.get(_version_key(namespace)) or 0), key)
+            blob = await client.get(k)
+        except redis.RedisError as e:
+            _redis_failed(e)
+        else:
+            _record(namespace, blob is not None)
+            if blob is not None:
+                return _loads(blob)
+            value = await loader()
+            try:
+                await client.set(k, _dumps(value), ex=max(1, int(ttl)))
+            except redis.RedisError as e:
+                _redis_failed(e)
+            return value
+
+    k = _local_key(namespace, key)
+    blob = _local_get(k)
+    _record(namespace, blob is not None)
+    if blob is not None:
+        return _loads(blob)
+    value = await loader()
+    _local_set(k, _dumps(value), ttl)
+    return value
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drop every cached entry of these namespaces, in this process and in Redis."""
+    _local_invalidate(namespaces)
+    if _redis_usable():
+        try:
+            client = _sync_client()
+            for ns in namespaces:
+                client.incr(_version_key(ns))
+        except redis.RedisError as e:
+            _redis_failed(e)
+
+
+async def ainvalidate(*namespaces: str) -> None:
+    _local_invalidate(namespaces)
+    if _redis_usable():
+        try:
+            client = _async_client()
+            for ns in namespaces:
+                await client.incr(_version_key(ns))
+        except redis.RedisError as e:
+            _redis_failed(e)
+
+
+# ---------- self-check ----------
+def check() -> None:
+    """Exercise the configured backend (Redis if REDIS_URL is set, else in-process); raises on a failure."""
+    import asyncio
+    import uuid
+    from datetime import timezone
+
+    ns = f"check-{uuid.uuid4().hex[:8]}"
+    calls = []
+
+    def loader(value):
+        def load():
+            calls.append(value)
+            return value
+        return load
+
+    row = {"date_filed": date(2024, 1, 2), "at": datetime(2024, 1, 2, 3, 4, tzinfo=timezone.utc),
+           "fee": Decimal("0.10"), "n": 1, "tags": ["a"]}
+    assert get_or_load(ns, "k", loader([row])) == [row]
+    assert get_or_load(ns, "k", loader("miss")) == [row] and len(calls) == 1, "second read did not hit"
+
+    invalidate(ns)
+    assert get_or_load(ns, "k", loader("fresh")) == "fresh", "invalidate() left the old entry readable"
+
+    async def async_side():
+        async def aload():
+            return "async"
+        assert await aget_or_load(ns, "k", aload) == "fresh", "sync entry not visible to aget_or_load"
+        await ainvalidate(ns)
+        assert await aget_or_load(ns, "k", aload) == "async"
+        if _aredis is not None:
+            await _aredis.aclose()  # bound to this loop
+    asyncio.run(async_side())
+
+    # A write that lands while a value is being loaded must not be hidden by it
+    def racing_load():
+        invalidate(ns)
+        return "stale"
+    assert get_or_load(ns, "race", racing_load) == "stale"
+    assert get_or_load(ns, "race", loader("current")) == "current", "value loaded across an invalidate() was served"
+
+    backend = "Redis" if _redis_usable() else "in-process"
+    print(f"✅ Cache check passed ({backend}).")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shared read-through cache.")
+    parser.add_argument("--check", action="store_true", help="exercise the configured backend and exit")
+    if parser.parse_args().check:
+        check()
@@ -1,20 +1,180 @@
 # db.py — Supabase Postgres via DATABASE_URL (clean)
+# Schema is owned by the Alembic migrations in migrations/ (python bootstrap_db.py)
 from __future__ import annotations
-import os, hashlib
-import psycopg
+import os, re, time, hashlib, threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from psycopg import AsyncCursor, Cursor
 from psycopg.rows import dict_row
 from psycopg import errors as pg_errors
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
 from typing import Optional
 
+import cache
+import metrics
+
 def _db_url() -> str:
     url = os.environ.get("DATABASE_URL")
     if not url:
         raise RuntimeError("DATABASE_URL is not set. Export it locally and set it in Reflex Cloud Secrets.")
     return url
 
+# ---------- connection pools ----------
+# Pool sizing/recycling is tunable per deployment via env vars; the defaults suit
+# a single Reflex worker talking to the Supabase transaction pooler.
+POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+POOL_MAX_IDLE = float(os.environ.get("DB_POOL_MAX_IDLE", "300"))          # seconds before an idle conn is closed
+POOL_MAX_LIFETIME = float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800"))  # seconds before a conn is recycled
+POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))              # seconds to wait for a free conn
+
+# Transaction poolers (pgbouncer / Supavisor on :6543) hand each transaction to a
+# different backend, so server-side prepared statements break. Keep them off
+# unless DB_PREPARED_STATEMENTS=on (direct connection / session pooler).
+PREPARED_STATEMENTS = os.environ.get("DB_PREPARED_STATEMENTS", "off").lower() in ("1", "on", "true", "yes")
+
+_pool: Optional[ConnectionPool] = None
+_async_pool: Optional[AsyncConnectionPool] = None
+_pool_lock = threading.Lock()
+
+# ---------- query timing ----------
+# Every statement run through a pooled connection is timed into
+# cop_db_query_seconds{op, table} (see metrics.py).
+# Write target of a DML statement; ON CONFLICT DO UPDATE / FOR UPDATE are not targets
+_TARGET_RE = re.compile(
+    r"\b(?:insert\s+into|(?<!do\s)(?<!for\s)update(?:\s+only)?|delete\s+from|copy)\s+([a-z_][\w.]*)",
+    re.IGNORECASE,
+)
+# Otherwise the first relation read; group 3 marks a function call such as unnest(...)
+_TABLE_RE = re.compile(
+    r"\b(from|join|table)\s+(?:if\s+(?:not\s+)?exists\s+)?([a-z_][\w.]*)(\s*\()?",
+    re.IGNORECASE,
+)
+
+@lru_cache(maxsize=512)
+def _query_labels(sql_text: str) -> tuple[str, str]:
+    """
+    (op, table) metric labels for a statement.
+
+    >>> _query_labels(_upsert_merge_sql(return_rows=True))
+    ('insert', 'pacer_cases')
+    >>> _store_trgm(False) or _query_labels(_search_cases_query("smith 3:24-cr", 100, 0, None)[0])
+    ('select', 'pacer_cases')
+    >>> _query_labels("UPDATE pacer_cases SET score = s FROM unnest(%s::bigint[]) AS u(case_id, s)")
+    ('update', 'pacer_cases')
+    >>> _query_labels("CREATE TABLE IF NOT EXISTS pacer_sync_state (region text)")
+    ('create', 'pacer_sync_state')
+    >>> _query_labels("")
+    ('check', '')
+    """
+    words = sql_text.split(None, 1)
+    op = words[0].lower() if words else "check"  # empty statement = pool health check
+    m = _TARGET_RE.search(sql_text)
+    if m:
+        return op, m.group(1).lower()
+    for m in _TABLE_RE.finditer(sql_text):
+        if not (m.group(3) and m.group(1).lower() != "table"):
+            return op, m.group(2).lower()
+    return op, ""
+
+def _labels_for(cursor, query) -> dict:
+    if not isinstance(query, str):
+        query = query.decode() if isinstance(query, bytes) else query.as_string(cursor)
+    op, table = _query_labels(query)
+    return {"op": op, "table": table}
+
+class TimedCursor(Cursor):
+    def execute(self, query, params=None, **kwargs):
+        with metrics.timed("db_query", **_labels_for(self, query)):
+            return super().execute(query, params, **kwargs)
+
+    def executemany(self, query, params_seq, **kwargs):
+        with metrics.timed("db_query", **_labels_for(self, query)):
+            return super().executemany(query, params_seq, **kwargs)
+
+class TimedAsyncCursor(AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        with metrics.timed("db_query", **_labels_for(self, query)):
+            return await super().execute(query, params, **kwargs)
+
+    async def executemany(self, query, params_seq, **kwargs):
+        with metrics.timed("db_query", **_labels_for(self, query)):
+            return await super().executemany(query, params_seq, **kwargs)
+
+def _conn_kwargs(cursor_factory=TimedCursor) -> dict:
+    kwargs = {"row_factory": dict_row, "autocommit": True, "cursor_factory": cursor_factory}
+    if not PREPARED_STATEMENTS:
+        kwargs["prepare_threshold"] = None
+    return kwargs
+
+def get_pool() -> ConnectionPool:
+    """Process-wide sync pool, opened lazily on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _db_url(),
+                    kwargs=_conn_kwargs(),
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    max_idle=POOL_MAX_IDLE,
+                    max_lifetime=POOL_MAX_LIFETIME,
+                    timeout=POOL_TIMEOUT,
+                    check=ConnectionPool.check_connection,
+                    name="cop",
+                    open=True,
+                )
+    return _pool
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """Process-wide async pool for code running on the event loop."""
+    global _async_pool
+    if _async_pool is None:
+        pool = AsyncConnectionPool(
+            _db_url(),
+            kwargs=_conn_kwargs(TimedAsyncCursor),
+            min_size=POOL_MIN_SIZE,
+            max_size=POOL_MAX_SIZE,
+            max_idle=POOL_MAX_IDLE,
+            max_lifetime=POOL_MAX_LIFETIME,
+            timeout=POOL_TIMEOUT,
+            check=AsyncConnectionPool.check_connection,
+            name="cop-async",
+            open=False,
+        )
+        await pool.open()
+        if _async_pool is None:
+            _async_pool = pool
+        else:
+            # another coroutine won the race while we were opening
+            await pool.close()
+    return _async_pool
+
 def get_conn():
-    # one connection per call; safe for Reflex Cloud/serverless
-    return psycopg.connect(_db_url(), row_factory=dict_row, autocommit=True)
+    """Borrow a pooled connection: `with get_conn() as c: ...` (returned to the pool on exit)."""
+    return get_pool().connection()
+
+@asynccontextmanager
+async def get_async_conn():
+    """Async twin of get_conn(): `async with get_async_conn() as c: ...`."""
+    pool = await get_async_pool()
+    async with pool.connection() as c:
+        yield c
+
+def close_pools():
+    """Close the sync pool (e.g. at process shutdown or in scripts)."""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
 
 # ---------- Auth & user CRUD ----------
 def hash_password(p: str) -> str:
@@ -28,10 +188,12 @@ def get_user(username: str, password: str):
         ).fetchone()
 
 def get_all_users():
-    with get_conn() as c:
-        return c.execute(
-            "SELECT username, permission FROM users ORDER BY username"
-        ).fetchall()
+    def load():
+        with get_conn() as c:
+            return c.execute(
+                "SELECT username, permission FROM users ORDER BY username"
+            ).fetchall()
+    return cache.get_or_load("users", "all", load)
 
 def add_user(username: str, password: str, permission: str):
     with get_conn() as c:
@@ -39,27 +201,32 @@ def add_user(username: str, password: str, permission: str):
             "INSERT INTO users (username, password, permission) VALUES (%s,%s,%s)",
             (username, hash_password(password), permission),
         )
+    cache.invalidate("users")
 
 def update_user_permission(username: str, permission: str):
     with get_conn() as c:
         c.execute("UPDATE users SET permission=%s WHERE username=%s", (permission, username))
+    cache.invalidate("users")
 
 def delete_user(username: str):
     with get_conn() as c:
         c.execute("DELETE FROM users WHERE username=%s", (username,))
+    cache.invalidate("users")
 
 # ---------- regions CRUD ----------
 def fetch_all_regions() -> list[dict]:
-    """Fetch all regions from the database."""
-    try:
-        with get_conn() as c:
-            rows = c.execute(
-                "SELECT id, region_name FROM regions ORDER BY region_name"
-            ).fetchall()
-            return [dict(r) for r in rows]
-    except pg_errors.UndefinedTable:
-        # If table isn't created yet, don't crash the UI
-        return []
+    """Fetch all regions from the database (read through the shared cache)."""
+    def load():
+        try:
+            with get_conn() as c:
+                rows = c.execute(
+                    "SELECT id, region_name FROM regions ORDER BY region_name"
+                ).fetchall()
+                return [dict(r) for r in rows]
+        except pg_errors.UndefinedTable:
+            # If table isn't created yet, don't crash the UI
+            return []
+    return cache.get_or_load("regions", "all", load)
 
 def add_region(region_name: str):
     """Add a new region to the database."""
@@ -68,6 +235,8 @@ def add_region(region_name: str):
             "INSERT INTO regions (region_name) VALUES (%s)",
             (region_name,),
         )
+    invalidate_court_lookup()
+    cache.invalidate("regions")
 
 def update_region(region_id: int, region_name: str):
     """Update an existing region in the database."""
@@ -76,11 +245,84 @@ def update_region(region_id: int, region_name: str):
             "UPDATE regions SET region_name=%s WHERE id=%s",
             (region_name, region_id),
         )
+    invalidate_court_lookup()
+    cache.invalidate("regions")
 
 def delete_region(region_id: int):
     """Delete a region from the database."""
     with get_conn() as c:
         c.execute("DELETE FROM regions WHERE id=%s", (region_id,))
+    invalidate_court_lookup()
+    cache.invalidate("regions")
+
+# ---------- court_ids / regions lookup cache ----------
+# Region -> court lookups happen for every region of every search, so court_ids
+# and regions are loaded once per process and reused until COURT_CACHE_TTL
+# expires or a region write in this process invalidates them. Writes from
+# other workers show up after at most one TTL.
+COURT_CACHE_TTL = float(os.environ.get("COURT_CACHE_TTL", "300"))  # seconds
+
+_court_lookup: Optional[dict] = None
+_court_lookup_lock = threading.Lock()
+
+COURT_LOOKUP_SQL = (
+    "SELECT court_id, region FROM court_ids ORDER BY region, court_id",
+    "SELECT id, region_name FROM regions ORDER BY region_name",
+)
+
+def _load_court_lookup() -> dict:
+    with get_conn() as c:
+        courts, regions = (c.execute(sql).fetchall() for sql in COURT_LOOKUP_SQL)
+    return _build_court_lookup(courts, regions)
+
+def _build_court_lookup(courts: list, regions: list) -> dict:
+    region_courts: dict[str, list[str]] = {}
+    for r in courts:
+        region_courts.setdefault(r["region"], []).append(r["court_id"])
+    return {
+        "region_courts": region_courts,
+        "court_regions": {r["court_id"]: r["region"] for r in courts},
+        "regions": [dict(r) for r in regions],
+        "expires_at": time.monotonic() + COURT_CACHE_TTL,
+    }
+
+def court_lookup() -> dict:
+    """Cached {"region_courts", "court_regions", "regions"} snapshot, reloaded when stale."""
+    global _court_lookup
+    lookup = _court_lookup
+    if lookup is None or lookup["expires_at"] <= time.monotonic():
+        with _court_lookup_lock:
+            lookup = _court_lookup
+            if lookup is None or lookup["expires_at"] <= time.monotonic():
+                lookup = _court_lookup = _load_court_lookup()
+    return lookup
+
+def invalidate_court_lookup():
+    global _court_lookup
+    _court_lookup = None
+
+def _cached_court_lookup() -> Optional[dict]:
+    lookup = _court_lookup
+    return lookup if lookup is not None and lookup["expires_at"] > time.monotonic() else None
+
+def _store_court_lookup(lookup: dict) -> dict:
+    global _court_lookup
+    _court_lookup = lookup
+    return lookup
+
+def court_id_for_region(region: str) -> Optional[str]:
+    courts = court_lookup()["region_courts"].get(region)
+    return courts[0] if courts else None
+
+def region_has_court(region: str) -> bool:
+    return region in court_lookup()["region_courts"]
+
+def fetch_cached_regions() -> list[dict]:
+    """Same rows as fetch_all_regions(), served from the lookup cache."""
+    try:
+        return [dict(r) for r in court_lookup()["regions"]]
+    except pg_errors.UndefinedTable:
+        return []
 
 # ---------- pacer_cases ----------
 def fetch_all_cases(limit: Optional[int] = None) -> list[dict]:
@@ -97,6 +339,217 @@ def fetch_all_cases(limit: Optional[int] = None) -> list[dict]:
         # If table isn't created yet, don't crash the UI
         return []
     
+# Grid columns that can be sorted server-side; each has a (col, case_id) index
+# (migrations/versions/0002, 0008) so keyset pages are an index range scan in either direction.
+SORTABLE_CASE_COLUMNS = ("case_title", "court_id", "case_id", "case_number", "date_filed", "opportunity_score")
+CASES_PAGE_SIZE = 100
+
+def _case_filters(court_id: Optional[str], search: Optional[str] = None) -> tuple[list[str], list]:
+    where, params = [], []
+    if court_id:
+        where.append("court_id = %s")
+        params.append(court_id)
+    if search and search.strip():
+        clause, search_params = _search_filter(search)
+        where.append(clause)
+        params.extend(search_params)
+    return where, params
+
+# ---------- case search ----------
+# Must match the expression index in migrations/versions/0005
+CASE_TSV = "to_tsvector('simple', coalesce(case_title, '') || ' ' || coalesce(case_number, ''))"
+SEARCH_COUNT_CAP = 2_000       # matches past the newest this many are neither ranked, counted nor paged (refine the search)
+SEARCH_MIN_FUZZY_LEN = 3       # trigram indexes can't serve shorter patterns
+
+TRGM_CHECK_SQL = "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+_has_trgm: Optional[bool] = None
+
+def trgm_enabled() -> bool:
+    """Whether pg_trgm is installed (fuzzy matching); checked once per process."""
+    global _has_trgm
+    if _has_trgm is None:
+        with get_conn() as c:
+            _has_trgm = c.execute(TRGM_CHECK_SQL).fetchone() is not None
+    return _has_trgm
+
+def _store_trgm(enabled: bool) -> bool:
+    global _has_trgm
+    _has_trgm = enabled
+    return enabled
+
+# The query text goes through the same parser as CASE_TSV and every lexeme is
+# prefix-matched, so partial input already hits: 'smi 3:24-cr-0001' ->
+# 'smi':* & '3':* & '24':* & 'cr':* & '-0001':*
+SEARCH_TSQUERY = (
+    "to_tsquery('simple', (SELECT coalesce(string_agg(quote_literal(lexeme) || ':*', ' & '), '') "
+    "FROM unnest(to_tsvector('simple', %s))))"
+)
+
+def _like_pattern(text: str) -> str:
+    return "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+def _search_filter(search: str) -> tuple[str, list]:
+    q = search.strip()
+    clauses, params = [], []
+    if re.search(r"\w", q):
+        clauses.append(f"{CASE_TSV} @@ {SEARCH_TSQUERY}")
+        params.append(q)
+    if len(q) >= SEARCH_MIN_FUZZY_LEN and trgm_enabled():
+        clauses.append("%s <%% case_title")           # fuzzy: typos in party names
+        params.append(q)
+        clauses.append("case_number ILIKE %s")       # substring of a docket number
+        params.append(_like_pattern(q))
+    if not clauses:
+        return "false", []
+    return "(" + " OR ".join(clauses) + ")", params
+
+def _search_rank(search: str) -> tuple[str, list]:
+    q = search.strip()
+    parts, params = ["(lower(case_number) = lower(%s))::int"], [q]   # exact docket number first
+    if re.search(r"\w", q):
+        parts.append(f"ts_rank({CASE_TSV}, {SEARCH_TSQUERY})")
+        params.append(q)
+    if trgm_enabled():
+        parts.append("word_similarity(%s, coalesce(case_title, ''))")
+        params.append(q)
+    return " + ".join(parts), params
+
+def search_cases(query: str, limit: int = CASES_PAGE_SIZE, offset: int = 0,
+                 court_id: Optional[str] = None) -> list[dict]:
+    """
+    Cases matching `query` by full text (prefix per word), fuzzy case_title or
+    case_number substring, best matches first. Each row carries its `rank`.
+    Only the newest SEARCH_COUNT_CAP matches (by the date_filed index, as
+    count_cases reports) plus any exact docket number are ranked: ts_rank
+    re-parses every row it scores, and ranking all of a common term's matches
+    cost over a second per page.
+    """
+    if not query or not query.strip():
+        return []
+    sql, params = _search_cases_query(query, limit, offset, court_id)
+    try:
+        with get_conn() as c:
+            rows = c.execute(sql, params).fetchall()
+            return [dict(r) for r in rows]
+    except pg_errors.UndefinedTable:
+        return []
+
+def _search_cases_query(query: str, limit: int, offset: int, court_id: Optional[str]) -> tuple[str, list]:
+    where, params = _case_filters(court_id, query)
+    exact_where, exact_params = _case_filters(court_id)
+    exact_where.append("case_number IN (%s, lower(%s))")   # served by the case_number index
+    exact_params += [query.strip()] * 2
+    rank_sql, rank_params = _search_rank(query)
+    sql = (
+        f"SELECT *, {rank_sql} AS rank FROM pacer_cases WHERE case_id IN ("
+        f"(SELECT case_id FROM pacer_cases WHERE {' AND '.join(where)} "
+        "ORDER BY date_filed DESC, case_id DESC LIMIT %s) "
+        f"UNION (SELECT case_id FROM pacer_cases WHERE {' AND '.join(exact_where)})) "
+        "ORDER BY rank DESC, case_id DESC LIMIT %s OFFSET %s"
+    )
+    return sql, rank_params + params + [SEARCH_COUNT_CAP] + exact_params + [max(0, limit), offset]
+
+def fetch_cases_page(
+    sort_column: str = "date_filed",
+    ascending: bool = False,
+    after: Optional[tuple] = None,
+    limit: int = CASES_PAGE_SIZE,
+    court_id: Optional[str] = None,
+    offset: int = 0,
+    search: Optional[str] = None,
+) -> list[dict]:
+    """
+    One keyset page of pacer_cases ordered by (sort_column, case_id).
+    `after` is the (sort value, case_id) of the last row of the previous page;
+    NULL sort values come last ascending and first descending (Postgres defaults,
+    which a single ascending index serves both ways). `offset` is for random
+    access (scrollbar jumps) and is applied after the keyset predicate.
+    `search` narrows the page to search matches; sort_column="rank" orders them
+    by relevance (offset paging only).
+    """
+    if sort_column == "rank":
+        return search_cases(search or "", limit, offset, court_id)
+    sql, params = _cases_page_query(sort_column, ascending, after, limit, court_id, offset, search)
+    try:
+        with get_conn() as c:
+            rows = c.execute(sql, params).fetchall()
+            return [dict(r) for r in rows]
+    except pg_errors.UndefinedTable:
+        # If table isn't created yet, don't crash the UI
+        return []
+
+def _cases_page_query(sort_column: str, ascending: bool, after: Optional[tuple], limit: int,
+                      court_id: Optional[str], offset: int, search: Optional[str]) -> tuple[str, list]:
+    """SQL + params for one fetch_cases_page keyset/offset page (not rank)."""
+    if sort_column not in SORTABLE_CASE_COLUMNS:
+        raise ValueError(f"Cannot sort pacer_cases by {sort_column!r}")
+    col = sort_column
+    where, params = _case_filters(court_id, search)
+
+    # Keyset predicates, one per index range. Past a non-NULL cursor ascending
+    # (or a NULL cursor descending) the page spans both the non-NULL and the
+    # NULL part of the sort column; an OR of the two can't bound an index scan,
+    # so each part becomes its own range query and the results are merged.
+    ranges: list[tuple[str, list]] = []
+    if after is not None:
+        value, last_id = after
+        if col == "case_id":
+            ranges.append(("case_id > %s" if ascending else "case_id < %s", [last_id]))
+        elif ascending and value is not None:
+            ranges.append((f"({col}, case_id) > (%s, %s)", [value, last_id]))
+            ranges.append((f"{col} IS NULL", []))
+        elif ascending:
+            ranges.append((f"{col} IS NULL AND case_id > %s", [last_id]))
+        elif value is not None:
+            ranges.append((f"({col}, case_id) < (%s, %s)", [value, last_id]))
+        else:
+            ranges.append((f"{col} IS NULL AND case_id < %s", [last_id]))
+            ranges.append((f"{col} IS NOT NULL", []))
+
+    direction = "ASC" if ascending else "DESC"
+    order = "case_id " + direction if col == "case_id" else f"{col} {direction}, case_id {direction}"
+    if len(ranges) == 2:
+        branches, branch_params = [], []
+        for predicate, predicate_params in ranges:
+            branches.append(
+                f"(SELECT * FROM pacer_cases WHERE {' AND '.join(where + [predicate])} ORDER BY {order} LIMIT %s)"
+            )
+            branch_params += params + predicate_params + [limit + offset]
+        sql = f"SELECT * FROM ({' UNION ALL '.join(branches)}) p"
+        params = branch_params
+    else:
+        for predicate, predicate_params in ranges:
+            where.append(predicate)
+            params.extend(predicate_params)
+        sql = "SELECT * FROM pacer_cases"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {order} LIMIT %s"
+    params.append(limit)
+    if offset:
+        sql += " OFFSET %s"
+        params.append(offset)
+    return sql, params
+
+def count_cases(court_id: Optional[str] = None, search: Optional[str] = None) -> int:
+    """Row count for the grid; with `search`, capped at SEARCH_COUNT_CAP."""
+    sql, params = _count_cases_query(court_id, search)
+    try:
+        with get_conn() as c:
+            return c.execute(sql, params).fetchone()["n"]
+    except pg_errors.UndefinedTable:
+        return 0
+
+def _count_cases_query(court_id: Optional[str], search: Optional[str]) -> tuple[str, list]:
+    where, params = _case_filters(court_id, search)
+    sql = "SELECT count(*) AS n FROM pacer_cases"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if search and search.strip():
+        sql = f"SELECT count(*) AS n FROM ({sql.replace('count(*) AS n', '1', 1)} LIMIT %s) m"
+        params.append(SEARCH_COUNT_CAP)
+    return sql, params
+
 def delete_cases_by_ids(case_ids: list[int]) -> int:
     """Delete cases by their case_ids and return count of deleted rows."""
     if not case_ids:
@@ -106,5 +559,434 @@ def delete_cases_by_ids(case_ids: list[int]) -> int:
         # Use placeholders for each case_id
         placeholders = ','.join(['%s'] * len(case_ids))
         sql = f"DELETE FROM pacer_cases WHERE case_id IN ({placeholders})"
-        result = c.execute(sql, case_ids)
-        return result.rowcount
\ No newline at end of file
+        deleted = c.execute(sql, case_ids).rowcount
+    if deleted:
+        cache.invalidate("cases")
+    return deleted
+
+def delete_cases_by_keys(keys: list[tuple[str, int]]) -> list[dict]:
+    """Delete cases by (court_id, case_id) pairs; returns the deleted rows."""
+    if not keys:
+        return []
+    sql, params = _delete_by_keys_query(keys)
+    with get_conn() as c:
+        deleted = [dict(r) for r in c.execute(sql, params).fetchall()]
+    if deleted:
+        cache.invalidate("cases")
+    return deleted
+
+def _delete_by_keys_query(keys: list[tuple[str, int]]) -> tuple[str, list]:
+    # Single DELETE using VALUES to avoid prepared statement reuse issues
+    placeholders = ",".join(["(%s,%s)"] * len(keys))
+    params: list = []
+    for court_id, case_id in keys:
+        params.extend([court_id, case_id])
+
+    sql = f"""
+        DELETE FROM pacer_cases AS p
+        USING (VALUES {placeholders}) AS v(court_id, case_id)
+        WHERE p.court_id = v.court_id AND p.case_id = v.case_id
+        RETURNING p.*
+    """
+    return sql, params
+
+# Columns written by the ingestion path, in COPY order.
+CASE_COLUMNS = (
+    "court_id", "case_id", "case_number", "case_type", "case_title", "date_filed",
+    "jurisdiction_type", "case_link", "case_summary", "parties", "attorney",
+)
+# Stored in pacer_cases.content_hash; an upsert whose hash matches is skipped.
+# json_build_array keeps NULL distinct from '' and renders dates as ISO
+# regardless of DateStyle (migration 0007 backfills with the same expression).
+CASE_CONTENT_HASH = f"md5(json_build_array({', '.join(CASE_COLUMNS)})::text)"
+
+def _upsert_merge_sql(return_rows: bool) -> str:
+    """Merge _stage_pacer_cases into pacer_cases (see bulk_upsert_cases)."""
+    cols = ", ".join(CASE_COLUMNS)
+    updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in CASE_COLUMNS if col != "case_id")
+    # xmax = 0 only for freshly inserted tuples, which gives exact counts
+    return f"""
+        INSERT INTO pacer_cases ({cols}, content_hash)
+        SELECT DISTINCT ON (case_id) {cols}, {CASE_CONTENT_HASH}
+          FROM _stage_pacer_cases
+         ORDER BY case_id, _ord DESC
+        ON CONFLICT (case_id) DO UPDATE SET {updates}, content_hash = EXCLUDED.content_hash
+         WHERE pacer_cases.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING (xmax = 0) AS _inserted{", pacer_cases.*" if return_rows else ""}
+    """
+
+def bulk_upsert_cases(rows: list[dict], return_rows: bool = False) -> dict:
+    """
+    Set-based upsert of pacer_cases rows (dicts keyed by CASE_COLUMNS).
+
+    Rows are COPYed into a transaction-scoped staging table and merged with a
+    single INSERT ... ON CONFLICT (case_id) DO UPDATE, so the whole batch is one
+    transaction and a handful of round trips regardless of size. Duplicate
+    case_ids within the batch collapse to the last occurrence. Existing rows
+    whose content_hash matches are left untouched (no new tuple, no WAL).
+    Returns exact {"inserted": n, "updated": m, "unchanged": k} counts; with
+    return_rows=True also "inserted_rows"/"updated_rows" holding the written
+    pacer_cases rows.
+    """
+    if not rows:
+        result = {"inserted": 0, "updated": 0, "unchanged": 0}
+        if return_rows:
+            result.update(inserted_rows=[], updated_rows=[])
+        return result
+
+    cols = ", ".join(CASE_COLUMNS)
+    with get_conn() as c, c.transaction():
+        with c.cursor() as cur:
+            # Same column types as pacer_cases, but no constraints/defaults
+            cur.execute(
+                f"CREATE TEMP TABLE _stage_pacer_cases ON COMMIT DROP AS "
+                f"SELECT 0::bigint AS _ord, {cols} FROM pacer_cases WITH NO DATA"
+            )
+            with cur.copy(f"COPY _stage_pacer_cases (_ord, {cols}) FROM STDIN") as copy:
+                for i, r in enumerate(rows):
+                    copy.write_row((i, *(r.get(col) for col in CASE_COLUMNS)))
+
+            cur.execute(_upsert_merge_sql(return_rows))
+            written = cur.fetchall()
+
+    # Skipped (unchanged) rows are the only ones not returned
+    inserted = sum(1 for r in written if r["_inserted"])
+    distinct = len({r.get("case_id") for r in rows})
+    result = {"inserted": inserted, "updated": len(written) - inserted, "unchanged": distinct - len(written)}
+    if written:
+        # A batch of unchanged cases leaves cached grid pages valid
+        cache.invalidate("cases")
+    if return_rows:
+        result["inserted_rows"] = [{k: v for k, v in r.items() if k != "_inserted"} for r in written if r["_inserted"]]
+        result["updated_rows"] = [{k: v for k, v in r.items() if k != "_inserted"} for r in written if not r["_inserted"]]
+    return result
+
+# ---------- pacer_sync_state (scheduled sync high-water marks) ----------
+def fetch_sync_states() -> dict[str, dict]:
+    """High-water marks keyed by region name."""
+    try:
+        with get_conn() as c:
+            rows = c.execute("SELECT * FROM pacer_sync_state").fetchall()
+            return {r["region"]: dict(r) for r in rows}
+    except pg_errors.UndefinedTable:
+        return {}
+
+def record_sync_run(region: str, last_date_filed, status: str, count: int):
+    """Store a run; the date mark only ever moves forward."""
+    with get_conn() as c:
+        c.execute(
+            """
+            INSERT INTO pacer_sync_state (region, last_date_filed, last_run_at, last_status, last_count)
+            VALUES (%s, %s, now(), %s, %s)
+            ON CONFLICT (region) DO UPDATE
+               SET last_date_filed = GREATEST(pacer_sync_state.last_date_filed, EXCLUDED.last_date_filed),
+                   last_run_at = EXCLUDED.last_run_at,
+                   last_status = EXCLUDED.last_status,
+                   last_count = EXCLUDED.last_count
+            """,
+            (region, last_date_filed, status, count),
+        )
+
+# ---------- pacer_backfill_windows (backfill.py checkpoints) ----------
+def fetch_backfill_windows(job: str) -> list[dict]:
+    """Every checkpointed window of a backfill job."""
+    try:
+        with get_conn() as c:
+            rows = c.execute(
+                "SELECT * FROM pacer_backfill_windows WHERE job = %s ORDER BY region, date_from",
+                (job,),
+            ).fetchall()
+            return [dict(r) for r in rows]
+    except pg_errors.UndefinedTable:
+        return []
+
+def save_backfill_window(job: str, region: str, date_from, date_to, status: str,
+                         cases: Optional[int] = None, error: Optional[str] = None):
+    """Insert or update one window; entering 'running' counts an attempt."""
+    with get_conn() as c:
+        c.execute(
+            """
+            INSERT INTO pacer_backfill_windows (job, region, date_from, date_to, status, cases, attempts, error)
+            VALUES (%s, %s, %s, %s, %s, %s, CASE WHEN %s = 'running' THEN 1 ELSE 0 END, %s)
+            ON CONFLICT (job, region, date_from, date_to) DO UPDATE
+               SET status = EXCLUDED.status,
+                   cases = coalesce(EXCLUDED.cases, pacer_backfill_windows.cases),
+                   attempts = pacer_backfill_windows.attempts + EXCLUDED.attempts,
+                   error = EXCLUDED.error,
+                   updated_at = now()
+            """,
+            (job, region, date_from, date_to, status, cases, status, error),
+        )
+
+# ---------- case enrichment (enrich.py: parsed ECF summary/parties/attorneys/charges) ----------
+# The pacer_cases fields an enrichment was built from; when they change the
+# case is queued again. json_build_array keeps NULLs in place (concat_ws would
+# skip them, so ('a', NULL, 'b') and ('a', 'b', NULL) hashed the same)
+CASE_SOURCE_HASH = "md5(json_build_array(p.court_id, p.case_number, p.case_title, p.date_filed, p.case_link)::text)"
+
+def fetch_enrichment_candidates(limit: int = 100, max_attempts: int = 3, max_age_days: Optional[float] = None,
+                                case_ids: Optional[list[int]] = None) -> list[dict]:
+    """
+    Cases that need (re-)enrichment, newest filings first: never enriched,
+    pacer_cases row changed since, failed fewer than max_attempts times, or
+    (with max_age_days) not checked for that long. `case_ids` forces a set.
+    """
+    if case_ids:
+        where, params = "p.case_id = ANY(%s)", [list(case_ids)]
+    else:
+        conds = [
+            "e.case_id IS NULL",
+            f"e.source_hash IS DISTINCT FROM {CASE_SOURCE_HASH}",
+            "(e.status = 'failed' AND e.attempts < %s)",
+        ]
+        params = [max_attempts]
+        if max_age_days is not None:
+            conds.append("(e.status = 'ok' AND e.checked_at < now() - make_interval(secs => %s))")
+            params.append(max_age_days * 86400)
+        where = "(" + " OR ".join(conds) + ")"
+    try:
+        with get_conn() as c:
+            rows = c.execute(
+                f"""
+                SELECT p.case_id, p.court_id, p.case_summary, p.parties, p.attorney,
+                       {CASE_SOURCE_HASH} AS source_hash, e.parsed_hash
+                  FROM pacer_cases p
+                  LEFT JOIN case_enrichment e ON e.case_id = p.case_id
+                 WHERE {where}
+                 ORDER BY p.date_filed DESC NULLS LAST, p.case_id DESC
+                 LIMIT %s
+                """,
+                params + [limit],
+            ).fetchall()
+            return [dict(r) for r in rows]
+    except pg_errors.UndefinedTable:
+        return []
+
+def save_enrichment(case_id: int, source_hash: str, parsed_hash: str, summary: dict,
+                    parties: list[dict], attorneys: list[dict], charges: list[dict]):
+    """Replace a case's parsed data in one transaction."""
+    with get_conn() as c, c.transaction():
+        for table in ("case_parties", "case_attorneys", "case_charges"):
+            c.execute(f"DELETE FROM {table} WHERE case_id = %s", (case_id,))
+        with c.cursor() as cur:
+            if parties:
+                cur.executemany(
+                    "INSERT INTO case_parties (case_id, position, role, name, details) VALUES (%s,%s,%s,%s,%s)",
+                    [(case_id, p["position"], p.get("role"), p["name"], p.get("details")) for p in parties],
+                )
+            if attorneys:
+                cur.executemany(
+                    "INSERT INTO case_attorneys (case_id, party_position, name, firm, contact, designation) "
+                    "VALUES (%s,%s,%s,%s,%s,%s)",
+                    [(case_id, a.get("party_position"), a["name"], a.get("firm"), a.get("contact"),
+                      a.get("designation")) for a in attorneys],
+                )
+            if charges:
+                cur.executemany(
+                    "INSERT INTO case_charges (case_id, defendant, status, count_number, description, disposition) "
+                    "VALUES (%s,%s,%s,%s,%s,%s)",
+                    [(case_id, ch.get("defendant"), ch.get("status"), ch.get("count_number"), ch["description"],
+                      ch.get("disposition")) for ch in charges],
+                )
+        c.execute(
+            """
+            INSERT INTO case_enrichment (case_id, status, source_hash, parsed_hash, summary, attempts, error, fetched_at, checked_at)
+            VALUES (%s, 'ok', %s, %s, %s, 0, NULL, now(), now())
+            ON CONFLICT (case_id) DO UPDATE
+               SET status = 'ok', source_hash = EXCLUDED.source_hash, parsed_hash = EXCLUDED.parsed_hash,
+                   summary = EXCLUDED.summary, attempts = 0, error = NULL,
+                   fetched_at = now(), checked_at = now()
+            """,
+            (case_id, source_hash, parsed_hash, Jsonb(summary)),
+        )
+
+def mark_enrichment_unchanged(case_id: int, source_hash: str):
+    """Pages parsed to the same data as last time: keep the rows, just record the check."""
+    with get_conn() as c:
+        c.execute(
+            """
+            UPDATE case_enrichment
+               SET status = 'ok', source_hash = %s, attempts = 0, error = NULL, checked_at = now()
+             WHERE case_id = %s
+            """,
+            (source_hash, case_id),
+        )
+
+def record_enrichment_failure(case_id: int, source_hash: str, error: str):
+    with get_conn() as c:
+        c.execute(
+            """
+            INSERT INTO case_enrichment (case_id, status, source_hash, attempts, error, checked_at)
+            VALUES (%s, 'failed', %s, 1, %s, now())
+            ON CONFLICT (case_id) DO UPDATE
+               SET status = 'failed', source_hash = EXCLUDED.source_hash, error = EXCLUDED.error,
+                   attempts = case_enrichment.attempts + 1, checked_at = now()
+            """,
+            (case_id, source_hash, error),
+        )
+
+def fetch_case_enrichment(case_id: int) -> Optional[dict]:
+    """Parsed summary, parties, attorneys and charges for one case (None if not enriched)."""
+    try:
+        with get_conn() as c:
+            row = c.execute("SELECT * FROM case_enrichment WHERE case_id = %s", (case_id,)).fetchone()
+            if row is None:
+                return None
+            result = dict(row)
+            for table, order in (("case_parties", "position"), ("case_attorneys", "party_position, id"),
+                                 ("case_charges", "id")):
+                result[table.removeprefix("case_")] = [
+                    dict(r) for r in c.execute(
+                        f"SELECT * FROM {table} WHERE case_id = %s ORDER BY {order}", (case_id,)
+                    ).fetchall()
+                ]
+            return result
+    except pg_errors.UndefinedTable:
+        return None
+
+# ---------- opportunity scoring (scoring.py) ----------
+# What a stored score was computed from; a case is rescored when any part changes.
+# json_build_array keeps NULL positions (an unenriched case has no parsed_hash),
+# which concat_ws would skip
+CASE_SCORE_HASH = "md5(json_build_array(p.content_hash, e.parsed_hash, %s::text)::text)"
+
+def fetch_scoring_batch(version: str, after_case_id: int = -1, limit: int = 5000, rescore: bool = False,
+                        case_ids: Optional[list[int]] = None) -> list[dict]:
+    """
+    Next keyset batch (by case_id) of cases whose score is missing or stale,
+    with their enriched charges flattened to one string and the number of
+    pending counts. `rescore` returns every case; `case_ids` limits the scan.
+    """
+    where, params = ["p.case_id > %s"], [version, after_case_id]
+    if not rescore:
+        where.append(f"p.score_hash IS DISTINCT FROM {CASE_SCORE_HASH}")
+        params.append(version)
+    if case_ids is not None:
+        where.append("p.case_id = ANY(%s)")
+        params.append(list(case_ids))
+    with get_conn() as c:
+        rows = c.execute(
+            f"""
+            SELECT p.case_id, p.court_id, p.case_type, p.case_title,
+                   ch.charges, coalesce(ch.pending_counts, 0) AS pending_counts,
+                   {CASE_SCORE_HASH} AS score_hash
+              FROM pacer_cases p
+              LEFT JOIN case_enrichment e ON e.case_id = p.case_id
+              LEFT JOIN LATERAL (
+                    SELECT string_agg(description, ' | ') AS charges,
+                           count(*) FILTER (WHERE status = 'pending') AS pending_counts
+                      FROM case_charges
+                     WHERE case_id = p.case_id
+                   ) ch ON true
+             WHERE {' AND '.join(where)}
+             ORDER BY p.case_id
+             LIMIT %s
+            """,
+            params + [limit],
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+def save_scores(case_ids: list[int], scores: list[int], score_hashes: list[str]) -> int:
+    """Write one batch of scores in a single UPDATE; returns rows updated."""
+    if not case_ids:
+        return 0
+    with get_conn() as c:
+        cur = c.execute(
+            """
+            UPDATE pacer_cases p
+               SET opportunity_score = v.score, score_hash = v.score_hash
+              FROM unnest(%s::bigint[], %s::smallint[], %s::text[]) AS v(case_id, score, score_hash)
+             WHERE p.case_id = v.case_id
+            """,
+            (list(case_ids), list(scores), list(score_hashes)),
+        )
+        updated = cur.rowcount
+    if updated:
+        cache.invalidate("cases")
+    return updated
+
+# ---------- pacer_search_ledger (PACER search cost + dedup cache) ----------
+def record_search(region: Optional[str], query_hash: str, params: dict, page: int, status: int,
+                  search_fee=None, billable_pages: Optional[int] = None, result_count: Optional[int] = None,
+                  latency_ms: Optional[int] = None, response: Optional[dict] = None, from_cache: bool = False):
+    """Append one /cases/find page to the ledger (live calls keep the response for dedup)."""
+    with get_conn() as c:
+        c.execute(
+            """
+            INSERT INTO pacer_search_ledger (region, query_hash, params, page, status, from_cache,
+                                             search_fee, billable_pages, result_count, latency_ms, response)
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            """,
+            (region, query_hash, Jsonb(params), page, status, from_cache,
+             search_fee, billable_pages, result_count, latency_ms,
+             Jsonb(response) if response is not None else None),
+        )
+
+def find_cached_search(query_hash: str, page: int, max_age_s: float) -> Optional[dict]:
+    """Most recent successful response for this query page younger than max_age_s."""
+    with get_conn() as c:
+        row = c.execute(
+            """
+            SELECT response FROM pacer_search_ledger
+             WHERE query_hash = %s AND page = %s AND status = 200 AND NOT from_cache
+               AND response IS NOT NULL
+               AND created_at > now() - make_interval(secs => %s)
+             ORDER BY created_at DESC
+             LIMIT 1
+            """,
+            (query_hash, page, max_age_s),
+        ).fetchone()
+        return row["response"] if row else None
+
+SEARCH_RESPONSE_PRUNE_BATCH = 5_000
+
+def expire_search_responses(max_age_s: float) -> int:
+    """
+    Drop stored responses older than max_age_s (find_cached_search never serves
+    them); the ledger rows themselves stay for the cost report. Works in
+    batches over the partial response index so a backlog never means one huge UPDATE.
+    """
+    expired = 0
+    with get_conn() as c:
+        while True:
+            n = c.execute(
+                """
+                UPDATE pacer_search_ledger SET response = NULL
+                 WHERE id IN (SELECT id FROM pacer_search_ledger
+                               WHERE response IS NOT NULL
+                                 AND created_at <= now() - make_interval(secs => %s)
+                               LIMIT %s)
+                """,
+                (max_age_s, SEARCH_RESPONSE_PRUNE_BATCH),
+            ).rowcount
+            expired += n
+            if n < SEARCH_RESPONSE_PRUNE_BATCH:
+                return expired
+
+# Batched multi-region searches are stored with region NULL; they are
+# reported under the courts they covered
+SEARCH_COSTS_SQL = """
+    SELECT coalesce(region,
+                    'Batched: ' || nullif(array_to_string(ARRAY(
+                        SELECT jsonb_array_elements_text(params -> 'courtId')), ', '), ''),
+                    'All') AS region,
+           count(*) FILTER (WHERE NOT from_cache)                    AS searches,
+           count(*) FILTER (WHERE from_cache)                        AS cache_hits,
+           coalesce(sum(search_fee), 0)::float                       AS fees,
+           coalesce(sum(billable_pages), 0)                          AS billable_pages,
+           coalesce(sum(result_count) FILTER (WHERE NOT from_cache), 0) AS results,
+           coalesce(round(avg(latency_ms) FILTER (WHERE NOT from_cache)), 0)::int AS avg_latency_ms
+      FROM pacer_search_ledger
+     WHERE created_at > now() - make_interval(days => %s)
+     GROUP BY 1
+     ORDER BY fees DESC, region
+"""
+
+def fetch_search_costs(days: int = 30) -> list[dict]:
+    """Per-region PACER spend, volume and latency over the last `days` days."""
+    try:
+        with get_conn() as c:
+            rows = c.execute(SEARCH_COSTS_SQL, (days,)).fetchall()
+            return [dict(r) for r in rows]
+    except pg_errors.UndefinedTable:
+        return []
@@ -0,0 +1,176 @@
+# db_async.py — async twin of the db.py helpers used by Reflex event handlers
+#
+# Reflex runs every event handler on one asyncio loop, so a synchronous db.py
+# call inside a handler stalls every connected user until its query returns.
+# These coroutines run the same SQL on db.get_async_conn() (the async pool)
+# instead; the case queries come from the same builders db.py uses and the
+# court/region lookup shares db.py's cache, so both stay in step. Users,
+# regions and the first grid window/count read through cache.py, keyed and
+# invalidated exactly like their db.py twins.
+# Scripts, CLIs and worker threads keep using db.py.
+from __future__ import annotations
+from typing import Optional
+
+from psycopg import errors as pg_errors
+
+import cache
+import db
+from db import CASES_PAGE_SIZE, get_async_conn, hash_password
+
+# ---------- Auth & user CRUD ----------
+async def get_user(username: str, password: str):
+    async with get_async_conn() as c:
+        cur = await c.execute(
+            "SELECT username, permission FROM users WHERE username=%s AND password=%s",
+            (username, hash_password(password)),
+        )
+        return await cur.fetchone()
+
+async def get_all_users():
+    async def load():
+        async with get_async_conn() as c:
+            cur = await c.execute("SELECT username, permission FROM users ORDER BY username")
+            return await cur.fetchall()
+    return await cache.aget_or_load("users", "all", load)
+
+async def add_user(username: str, password: str, permission: str):
+    async with get_async_conn() as c:
+        await c.execute(
+            "INSERT INTO users (username, password, permission) VALUES (%s,%s,%s)",
+            (username, hash_password(password), permission),
+        )
+    await cache.ainvalidate("users")
+
+async def update_user_permission(username: str, permission: str):
+    async with get_async_conn() as c:
+        await c.execute("UPDATE users SET permission=%s WHERE username=%s", (permission, username))
+    await cache.ainvalidate("users")
+
+async def delete_user(username: str):
+    async with get_async_conn() as c:
+        await c.execute("DELETE FROM users WHERE username=%s", (username,))
+    await cache.ainvalidate("users")
+
+# ---------- regions CRUD ----------
+async def fetch_all_regions() -> list[dict]:
+    async def load():
+        try:
+            async with get_async_conn() as c:
+                cur = await c.execute("SELECT id, region_name FROM regions ORDER BY region_name")
+                return [dict(r) for r in await cur.fetchall()]
+        except pg_errors.UndefinedTable:
+            return []
+    return await cache.aget_or_load("regions", "all", load)
+
+async def add_region(region_name: str):
+    async with get_async_conn() as c:
+        await c.execute("INSERT INTO regions (region_name) VALUES (%s)", (region_name,))
+    db.invalidate_court_lookup()
+    await cache.ainvalidate("regions")
+
+async def update_region(region_id: int, region_name: str):
+    async with get_async_conn() as c:
+        await c.execute("UPDATE regions SET region_name=%s WHERE id=%s", (region_name, region_id))
+    db.invalidate_court_lookup()
+    await cache.ainvalidate("regions")
+
+async def delete_region(region_id: int):
+    async with get_async_conn() as c:
+        await c.execute("DELETE FROM regions WHERE id=%s", (region_id,))
+    db.invalidate_court_lookup()
+    await cache.ainvalidate("regions")
+
+# ---------- court_ids / regions lookup cache (shared with db.court_lookup) ----------
+async def court_lookup() -> dict:
+    lookup = db._cached_court_lookup()
+    if lookup is None:
+        async with get_async_conn() as c:
+            courts, regions = [await (await c.execute(sql)).fetchall() for sql in db.COURT_LOOKUP_SQL]
+        lookup = db._store_court_lookup(db._build_court_lookup(courts, regions))
+    return lookup
+
+async def region_has_court(region: str) -> bool:
+    return region in (await court_lookup())["region_courts"]
+
+async def fetch_cached_regions() -> list[dict]:
+    try:
+        return [dict(r) for r in (await court_lookup())["regions"]]
+    except pg_errors.UndefinedTable:
+        return []
+
+# ---------- pacer_cases ----------
+async def trgm_enabled() -> bool:
+    if db._has_trgm is None:
+        async with get_async_conn() as c:
+            row = await (await c.execute(db.TRGM_CHECK_SQL)).fetchone()
+        db._store_trgm(row is not None)
+    return db._has_trgm
+
+async def search_cases(query: str, limit: int = CASES_PAGE_SIZE, offset: int = 0,
+                       court_id: Optional[str] = None) -> list[dict]:
+    if not query or not query.strip():
+        return []
+    await trgm_enabled()  # the builders check it synchronously
+    sql, params = db._search_cases_query(query, limit, offset, court_id)
+    try:
+        async with get_async_conn() as c:
+            return [dict(r) for r in await (await c.execute(sql, params)).fetchall()]
+    except pg_errors.UndefinedTable:
+        return []
+
+async def fetch_cases_page(
+    sort_column: str = "date_filed",
+    ascending: bool = False,
+    after: Optional[tuple] = None,
+    limit: int = CASES_PAGE_SIZE,
+    court_id: Optional[str] = None,
+    offset: int = 0,
+    search: Optional[str] = None,
+) -> list[dict]:
+    """See db.fetch_cases_page. The first page of each ordering/filter is cached."""
+    async def load():
+        if sort_column == "rank":
+            return await search_cases(search or "", limit, offset, court_id)
+        if search:
+            await trgm_enabled()
+        sql, params = db._cases_page_query(sort_column, ascending, after, limit, court_id, offset, search)
+        try:
+            async with get_async_conn() as c:
+                return [dict(r) for r in await (await c.execute(sql, params)).fetchall()]
+        except pg_errors.UndefinedTable:
+            return []
+
+    if after is not None or offset:
+        # Deeper pages are one-off keyset/offset reads while scrolling
+        return await load()
+    return await cache.aget_or_load("cases", ("page", sort_column, ascending, limit, court_id, search), load)
+
+async def count_cases(court_id: Optional[str] = None, search: Optional[str] = None) -> int:
+    async def load():
+        if search:
+            await trgm_enabled()
+        sql, params = db._count_cases_query(court_id, search)
+        try:
+            async with get_async_conn() as c:
+                return (await (await c.execute(sql, params)).fetchone())["n"]
+        except pg_errors.UndefinedTable:
+            return 0
+    return await cache.aget_or_load("cases", ("count", court_id, search), load)
+
+async def delete_cases_by_keys(keys: list[tuple[str, int]]) -> list[dict]:
+    if not keys:
+        return []
+    sql, params = db._delete_by_keys_query(keys)
+    async with get_async_conn() as c:
+        deleted = [dict(r) for r in await (await c.execute(sql, params)).fetchall()]
+    if deleted:
+        await cache.ainvalidate("cases")
+    return deleted
+
+# ---------- pacer_search_ledger ----------
+async def fetch_search_costs(days: int = 30) -> list[dict]:
+    try:
+        async with get_async_conn() as c:
+            return [dict(r) for r in await (await c.execute(db.SEARCH_COSTS_SQL, (days,))).fetchall()]
+    except pg_errors.UndefinedTable:
+        return []
@@ -0,0 +1,325 @@
+# enrich.py — fetch and parse ECF case pages into local tables
+#
+# For cases that are new (or whose pacer_cases row changed) this fetches the
+# court's own qrySummary.pl / qryParties.pl / qryAttorneys.pl pages, parses
+# them into case_enrichment (summary), case_parties, case_attorneys and
+# case_charges, and records a hash of the parsed result so a re-check that
+# finds nothing new does not rewrite anything.
+#
+#   python enrich.py                         # up to --limit pending cases
+#   python enrich.py --limit 500 --workers 8 --rate-limit 2
+#   python enrich.py --case-id 816714        # force specific cases
+#   python enrich.py --max-age-days 30       # also re-check cases enriched a month ago
+#
+# ECF page views are billed like searches, so runs are bounded by --limit and
+# spaced per ECF host by --rate-limit requests/second.
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+import metrics
+import pacer_api
+import scoring
+from db import (fetch_enrichment_candidates, mark_enrichment_unchanged, record_enrichment_failure,
+                save_enrichment)
+
+ENRICH_CONCURRENCY = int(os.environ.get("PACER_ECF_CONCURRENCY", "4"))
+ENRICH_RATE_LIMIT = float(os.environ.get("PACER_ECF_RATE_LIMIT", "2"))   # requests/s per ECF host
+ENRICH_BATCH = 100
+MAX_ATTEMPTS = 3
+
+# (result key, ECF script)
+ECF_PAGES = (("summary", "qrySummary.pl"), ("parties", "qryParties.pl"), ("attorneys", "qryAttorneys.pl"))
+
+# ===== HTML -> text lines =====
+_BLOCK_TAGS = {"br", "p", "div", "tr", "li", "table", "h1", "h2", "h3", "h4", "hr", "center"}
+
+
+class _TextLines(HTMLParser):
+    """Flatten ECF HTML into lines; table cells on one row are joined by a tab."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._cells: List[str] = []
+        self._text: List[str] = []
+        self._skip = 0
+
+    def _flush_cell(self):
+        text = " ".join("".join(self._text).split())
+        if text:
+            self._cells.append(text)
+        self._text = []
+
+    def _flush_line(self):
+        self._flush_cell()
+        if self._cells:
+            self.lines.append("\t".join(self._cells))
+        self._cells = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+        elif tag in ("td", "th"):
+            self._flush_cell()
+        elif tag in _BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._skip = max(0, self._skip - 1)
+        elif tag in ("td", "th"):
+            self._flush_cell()
+        elif tag in _BLOCK_TAGS:
+            self._flush_line()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush_line()
+
+
+def html_lines(html: str) -> List[str]:
+    parser = _TextLines()
+    parser.feed(html or "")
+    parser.close()
+    return parser.lines
+
+
+# ===== Parsers =====
+ROLE_RE = re.compile(
+    r"^(Defendant|Plaintiff|Petitioner|Respondent|Material Witness|Interested Party|Movant|Intervenor|"
+    r"Witness|Appellant|Appellee|Debtor|Creditor)(?:\s*\((\d+)\))?\s*$",
+    re.IGNORECASE,
+)
+ATTORNEY_FLAGS = ("LEAD ATTORNEY", "ATTORNEY TO BE NOTICED", "PRO HAC VICE", "TERMINATED:")
+CONTACT_RE = re.compile(r"(@|Email:|Fax:|\(\d{3}\)|\d{3}[-.]\d{3}[-.]\d{4}|\b[A-Z]{2} \d{5}\b|^\d+ )")
+COUNT_SECTION_RE = re.compile(r"^(Pending Counts|Terminated Counts|Complaints)\b", re.IGNORECASE)
+COUNT_NUMBER_RE = re.compile(r"\(([0-9][0-9a-z\-, ]*)\)\s*$")
+SECTION_END_RE = re.compile(r"^(Highest Offense Level|Plaintiff|Defendant|Date Filed|Docket Text|Case Summary)\b",
+                            re.IGNORECASE)
+LABEL_RE = re.compile(r"^([A-Za-z][A-Za-z /'().-]{1,40}):\s*(.+)$")
+
+
+def parse_parties(html: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parties (role, name, details) and their attorneys from a qryParties/qryAttorneys page."""
+    parties: List[Dict[str, Any]] = []
+    attorneys: List[Dict[str, Any]] = []
+    party: Optional[Dict[str, Any]] = None
+    attorney: Optional[Dict[str, Any]] = None
+    mode = None   # "name" -> "details" -> "attorney"
+    cells = (cell.strip() for line in html_lines(html) for cell in line.split("\t"))
+    for text in cells:
+        m = ROLE_RE.match(text)
+        if m:
+            party = {"position": len(parties) + 1, "role": m.group(1).title(), "name": None, "details": None}
+            attorney, mode = None, "name"
+            continue
+        if party is None or not text:
+            continue
+        if COUNT_SECTION_RE.match(text) or text.startswith("Highest Offense Level"):
+            # Criminal dockets list the defendant's counts after the attorneys
+            mode, attorney = None, None
+            continue
+        if text.lower().startswith("represented by"):
+            if party["name"] is not None:
+                mode, attorney = "attorney", None
+            continue
+        if mode == "name":
+            party["name"] = text
+            parties.append(party)
+            mode = "details"
+        elif mode == "details":
+            party["details"] = f"{party['details']}; {text}" if party["details"] else text
+        elif mode == "attorney":
+            flag = text.upper().startswith(ATTORNEY_FLAGS) or text.startswith("Designation:")
+            if attorney is None or (not flag and attorney.get("designation")):
+                attorney = {"party_position": party["position"], "name": text,
+                            "firm": None, "contact": None, "designation": None}
+                attorneys.append(attorney)
+            elif flag:
+                value = text.removeprefix("Designation:").strip()
+                attorney["designation"] = f"{attorney['designation']}; {value}" if attorney["designation"] else value
+            elif CONTACT_RE.search(text) or attorney["firm"]:
+                attorney["contact"] = f"{attorney['contact']}, {text}" if attorney["contact"] else text
+            else:
+                attorney["firm"] = text
+    return parties, attorneys
+
+
+def parse_charges(html: str) -> List[Dict[str, Any]]:
+    """Counts listed under Pending Counts / Terminated Counts / Complaints, per defendant."""
+    charges: List[Dict[str, Any]] = []
+    defendant = None
+    status = None
+    want_name = False
+    for line in html_lines(html):
+        text = line.strip()
+        m = ROLE_RE.match(text)
+        if m:
+            # The first line after "Defendant (n)" is the defendant's name
+            want_name = m.group(1).lower() == "defendant"
+            status = None
+            continue
+        if want_name:
+            defendant = text.split("\t")[0]
+            want_name = False
+            continue
+        section = COUNT_SECTION_RE.match(text)
+        if section:
+            status = {"pending counts": "pending", "terminated counts": "terminated",
+                      "complaints": "complaint"}[section.group(1).lower()]
+            continue
+        if status is None:
+            continue
+        if SECTION_END_RE.match(text):
+            status = None
+            continue
+        cells = [c.strip() for c in text.split("\t") if c.strip()]
+        if not cells or cells[0].lower() in ("none", "disposition"):
+            continue
+        description = cells[0]
+        count = COUNT_NUMBER_RE.search(description)
+        charges.append({
+            "defendant": defendant,
+            "status": status,
+            "count_number": count.group(1) if count else None,
+            "description": description,
+            "disposition": cells[1] if len(cells) > 1 else None,
+        })
+    return charges
+
+
+def parse_summary(html: str) -> Dict[str, str]:
+    """'Label: value' pairs from qrySummary.pl (presiding judge, dates, case type, ...)."""
+    summary: Dict[str, str] = {}
+    for line in html_lines(html):
+        for cell in line.split("\t"):
+            m = LABEL_RE.match(cell.strip())
+            if m:
+                key = re.sub(r"[^a-z0-9]+", "_", m.group(1).lower()).strip("_")
+                summary.setdefault(key, m.group(2).strip())
+    return summary
+
+
+def parse_case_pages(pages: Dict[str, str]) -> Dict[str, Any]:
+    parties, attorneys = parse_parties(pages.get("parties", ""))
+    if not attorneys:
+        # qryAttorneys lists the same "represented by" blocks when qryParties omits them
+        _, attorneys = parse_parties(pages.get("attorneys", ""))
+    # qryParties attributes counts to a defendant; qrySummary only lists them
+    charges = parse_charges(pages.get("parties", "")) or parse_charges(pages.get("summary", ""))
+    return {
+        "summary": parse_summary(pages.get("summary", "")),
+        "parties": parties,
+        "attorneys": attorneys,
+        "charges": charges,
+    }
+
+
+def parsed_hash(parsed: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(parsed, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ===== Worker =====
+async def fetch_case_pages(case: Dict[str, Any], token: str, limiter: pacer_api.HostRateLimiter) -> Dict[str, str]:
+    pages: Dict[str, str] = {}
+    for key, script in ECF_PAGES:
+        url = pacer_api.ecf_url(case["court_id"], script, case["case_id"])
+        if not url:
+            raise ValueError(f"no ECF link for case {case['case_id']} (court_id or ECF_URL missing)")
+        await limiter.wait(url)
+        with metrics.timed("ecf_page", page=key):
+            r = await pacer_api.ahttp_get(url, headers={"Cookie": f"NextGenCSO={token}"})
+        if r.status_code in (301, 302, 303, 401):
+            raise PermissionError(f"ECF refused the session ({r.status_code}) for {url}")
+        r.raise_for_status()
+        pages[key] = r.text
+    return pages
+
+
+async def enrich_case(case: Dict[str, Any], token_box: Dict[str, str], limiter: pacer_api.HostRateLimiter) -> str:
+    """Fetch, parse and store one case; returns 'updated', 'unchanged' or 'failed'."""
+    try:
+        try:
+            pages = await fetch_case_pages(case, token_box["token"], limiter)
+        except PermissionError:
+            # Session expired: one shared re-login, then retry this case once
+            stale = token_box["token"]
+            token_box["token"] = await asyncio.to_thread(pacer_api.token_manager().refresh, stale) or stale
+            pages = await fetch_case_pages(case, token_box["token"], limiter)
+        parsed = parse_case_pages(pages)
+        digest = parsed_hash(parsed)
+        if digest == case.get("parsed_hash"):
+            await asyncio.to_thread(mark_enrichment_unchanged, case["case_id"], case["source_hash"])
+            metrics.inc("enrich_cases_total", result="unchanged")
+            return "unchanged"
+        await asyncio.to_thread(save_enrichment, case["case_id"], case["source_hash"], digest,
+                                parsed["summary"], parsed["parties"], parsed["attorneys"], parsed["charges"])
+        metrics.inc("enrich_cases_total", result="updated")
+        return "updated"
+    except Exception as e:
+        print(f"❌ Enrichment failed for case {case['case_id']}: {type(e).__name__}: {e}")
+        await asyncio.to_thread(record_enrichment_failure, case["case_id"], case["source_hash"],
+                                f"{type(e).__name__}: {e}")
+        metrics.inc("enrich_cases_total", result="failed")
+        return "failed"
+
+
+async def run_enrichment(cases: List[Dict[str, Any]], workers: int = ENRICH_CONCURRENCY,
+                         rate_limit: float = ENRICH_RATE_LIMIT) -> Dict[str, int]:
+    totals = {"updated": 0, "unchanged": 0, "failed": 0}
+    if not cases:
+        return totals
+    if not pacer_api.env_cfg(pacer_api.ENV).get("ECF_URL"):
+        print(f"❌ Enrichment aborted: no ECF host configured for {pacer_api.ENV} (set PACER_QA_ECF_URL).")
+        return totals
+    token = await asyncio.to_thread(pacer_api.get_token, pacer_api.ENV)
+    if not token:
+        print("❌ Enrichment aborted: authentication failed.")
+        return totals
+    token_box = {"token": token}
+    limiter = pacer_api.HostRateLimiter(rate_limit)
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def run(case):
+        async with semaphore:
+            totals[await enrich_case(case, token_box, limiter)] += 1
+
+    try:
+        await asyncio.gather(*(run(case) for case in cases))
+    finally:
+        await pacer_api.aclose_http_clients()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch and parse ECF summary/parties/attorney pages for stored cases.")
+    parser.add_argument("--limit", type=int, default=ENRICH_BATCH, help="most cases to enrich this run")
+    parser.add_argument("--workers", type=int, default=ENRICH_CONCURRENCY)
+    parser.add_argument("--rate-limit", type=float, default=ENRICH_RATE_LIMIT, help="requests/s per ECF host")
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, help="give up on a case after this many failures")
+    parser.add_argument("--max-age-days", type=float, help="also re-check cases last checked this long ago")
+    parser.add_argument("--case-id", type=int, action="append", help="enrich these cases regardless of state")
+    args = parser.parse_args()
+
+    cases = fetch_enrichment_candidates(args.limit, args.max_attempts, args.max_age_days, args.case_id)
+    print(f"🔎 {len(cases)} case(s) to enrich.")
+    totals = asyncio.run(run_enrichment(cases, args.workers, args.rate_limit))
+    print(f"💾 Enrichment: updated={totals['updated']} unchanged={totals['unchanged']} failed={totals['failed']}")
+    if totals["updated"]:
+        # New charge data feeds the opportunity score
+        scored = scoring.score_pending()
+        print(f"🎯 Rescored {scored['scored']} case(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# metrics.py — in-process counters/histograms, rendered in Prometheus text format
+#
+# Hot paths record into a process-wide registry:
+#   with timed("pacer_auth"): ...                       -> cop_pacer_auth_seconds{...}
+#   @timed("handler", handler="load_grid_data")          -> cop_handler_seconds{handler=...}
+#   inc("pacer_http_events_total", event="retry_429")
+# and COP/COP.py serves render() at GET /metrics. Values are per process, so with
+# several backend workers each one reports its own series.
+from __future__ import annotations
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+PREFIX = "cop_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; spans both sub-ms DB lookups and multi-minute PACER ingests
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[str, Dict[Labels, float]] = {}
+_histograms: Dict[str, Dict[Labels, list]] = {}  # name -> labels -> [bucket counts..., sum, count]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, "" if v is None else str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    key = _labels(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0.0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = _labels(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        h = series.get(key)
+        if h is None:
+            h = series[key] = [0] * len(DEFAULT_BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if value <= bound:
+                h[i] += 1
+        h[-2] += value
+        h[-1] += 1
+
+
+class timed:
+    """
+    Timing span: records `<name>_seconds` and, when the body raises,
+    `<name>_errors_total{error=<exception type>}`. Works as a context manager
+    and as a decorator on sync or async functions (Reflex handlers included).
+    """
+
+    def __init__(self, name: str, **labels):
+        self.name = name
+        self.labels = labels
+        self._t0: Optional[float] = None
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(f"{self.name}_seconds", time.perf_counter() - self._t0, **self.labels)
+        if exc_type is not None:
+            inc(f"{self.name}_errors_total", error=exc_type.__name__, **self.labels)
+        return False
+
+    def __call__(self, fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timed(self.name, **self.labels):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(self.name, **self.labels):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def render() -> str:
+    """Current registry in Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for name in sorted(_counters):
+            full = PREFIX + name
+            lines.append(f"# TYPE {full} counter")
+            for labels, value in sorted(_counters[name].items()):
+                lines.append(f"{full}{_fmt_labels(labels)} {value:g}")
+        for name in sorted(_histograms):
+            full = PREFIX + name
+            lines.append(f"# TYPE {full} histogram")
+            for labels, h in sorted(_histograms[name].items()):
+                for bound, count in zip(DEFAULT_BUCKETS, h):
+                    lines.append(f"{full}_bucket{_fmt_labels(labels, (('le', f'{bound:g}'),))} {count}")
+                lines.append(f"{full}_bucket{_fmt_labels(labels, (('le', '+Inf'),))} {h[-1]}")
+                lines.append(f"{full}_sum{_fmt_labels(labels)} {h[-2]:.6f}")
+                lines.append(f"{full}_count{_fmt_labels(labels)} {h[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
@@ -0,0 +1,46 @@
+# migrations/env.py — Alembic environment for the COP schema
+#
+# Migrations are plain SQL (op.execute); there are no SQLAlchemy models, so
+# autogenerate is not used. The URL comes from DATABASE_URL and is switched to
+# the psycopg (v3) driver the app already depends on.
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+
+def database_url() -> str:
+    url = os.environ.get("DATABASE_URL")
+    if not url:
+        raise RuntimeError("DATABASE_URL is not set. Export it locally and set it in Reflex Cloud Secrets.")
+    for prefix in ("postgresql+psycopg://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+psycopg://" + url[len(prefix):]
+    return url
+
+
+def run_migrations_offline() -> None:
+    context.configure(url=database_url(), literal_binds=True, transaction_per_migration=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # Transaction poolers (Supabase :6543) can't keep server-side prepared statements
+    engine = create_engine(database_url(), poolclass=pool.NullPool,
+                           connect_args={"prepare_threshold": None})
+    with engine.connect() as connection:
+        context.configure(connection=connection, transaction_per_migration=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,74 @@
+"""base schema: users, regions, court_ids, pacer_cases
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Written with IF NOT EXISTS so it can run against the existing Supabase
+database as well as an empty one.
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            username   text PRIMARY KEY,
+            password   text NOT NULL,            -- sha256 hex, see db.hash_password
+            permission text NOT NULL DEFAULT 'browse'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS regions (
+            id          serial PRIMARY KEY,
+            region_name text NOT NULL
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS court_ids (
+            court_id text NOT NULL,
+            region   text NOT NULL
+        )
+        """
+    )
+    # get_court_id_from_region / admin validation look courts up by region
+    op.execute("CREATE INDEX IF NOT EXISTS court_ids_region_idx ON court_ids (region)")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pacer_cases (
+            id                serial PRIMARY KEY,
+            court_id          text,
+            case_id           bigint NOT NULL,
+            case_number       text,
+            case_type         text,
+            case_title        text,
+            date_filed        date,
+            jurisdiction_type text,
+            case_link         text,
+            case_summary      text,
+            parties           text,
+            attorney          text,
+            CONSTRAINT pacer_cases_case_id_key UNIQUE (case_id)
+        )
+        """
+    )
+    # Older databases created the table by hand; the upsert's ON CONFLICT (case_id)
+    # needs a unique index whether or not the named constraint is there
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS pacer_cases_case_id_key ON pacer_cases (case_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS pacer_cases")
+    op.execute("DROP TABLE IF EXISTS court_ids")
+    op.execute("DROP TABLE IF EXISTS regions")
+    op.execute("DROP TABLE IF EXISTS users")
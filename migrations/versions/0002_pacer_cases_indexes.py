@@ -0,0 +1,41 @@
+"""pacer_cases indexes for keyset paging, court filter and keyed deletes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Every sortable grid column gets a (col, case_id) index so keyset pages are an
+index range scan in either direction; (court_id, case_id) also serves the
+delete_cases_by_keys join, and (court_id, date_filed, case_id) the court filter
+on the default date_filed DESC order. Built CONCURRENTLY so a large live table
+is not locked.
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# case_id sorts use the unique pacer_cases_case_id_key index
+SORT_COLUMNS = ("case_title", "court_id", "case_number", "date_filed")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for col in SORT_COLUMNS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS pacer_cases_{col}_case_id_idx "
+                f"ON pacer_cases ({col}, case_id)"
+            )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS pacer_cases_court_id_date_filed_idx "
+            "ON pacer_cases (court_id, date_filed, case_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS pacer_cases_court_id_date_filed_idx")
+        for col in SORT_COLUMNS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS pacer_cases_{col}_case_id_idx")
@@ -0,0 +1,62 @@
+"""pacer_sync_state and pacer_search_ledger
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Tables previously created on demand by db.ensure_sync_state_table() and
+db.ensure_search_ledger_table().
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pacer_sync_state (
+            region          text PRIMARY KEY,
+            last_date_filed date,
+            last_run_at     timestamptz,
+            last_status     text,
+            last_count      integer
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pacer_search_ledger (
+            id             bigserial PRIMARY KEY,
+            created_at     timestamptz NOT NULL DEFAULT now(),
+            region         text,
+            query_hash     text NOT NULL,
+            params         jsonb NOT NULL,
+            page           integer NOT NULL,
+            status         integer NOT NULL,
+            from_cache     boolean NOT NULL DEFAULT false,
+            search_fee     numeric(10, 2),
+            billable_pages integer,
+            result_count   integer,
+            latency_ms     integer,
+            response       jsonb
+        )
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS pacer_search_ledger_lookup_idx "
+        "ON pacer_search_ledger (query_hash, page, created_at DESC)"
+    )
+    # fetch_search_costs scans a trailing window
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS pacer_search_ledger_created_at_idx "
+        "ON pacer_search_ledger (created_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS pacer_search_ledger")
+    op.execute("DROP TABLE IF EXISTS pacer_sync_state")
@@ -0,0 +1,39 @@
+"""pacer_backfill_windows: checkpoints for backfill.py
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+One row per (job, region, date window). A window that hit the result cap is
+marked 'split' and its two halves are added as new rows, so a resumed job
+skips 'done' and 'split' windows and re-runs everything else.
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pacer_backfill_windows (
+            job        text NOT NULL,
+            region     text NOT NULL,
+            date_from  date NOT NULL,
+            date_to    date NOT NULL,
+            status     text NOT NULL DEFAULT 'pending',   -- pending | running | done | split | failed
+            cases      integer,
+            attempts   integer NOT NULL DEFAULT 0,
+            error      text,
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (job, region, date_from, date_to)
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS pacer_backfill_windows")
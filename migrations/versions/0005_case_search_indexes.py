@@ -0,0 +1,56 @@
+"""case search: tsvector and trigram indexes on case_title / case_number
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Full-text matching uses an expression GIN index on db.CASE_TSV (kept as an
+expression rather than a stored column so SELECT * rows sent to the grid stay
+small); fuzzy/substring matching uses pg_trgm GIN indexes. pg_trgm ships with
+Supabase; where the extension is not available (bare local Postgres) the
+trigram indexes are skipped and db.search falls back to full-text only.
+Offline (--sql) there is no server to ask, so the script assumes pg_trgm is
+available, as it is on the deploy target.
+"""
+from alembic import context, op
+from sqlalchemy import text
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# Must match db.CASE_TSV exactly or the planner will not use the index
+CASE_TSV = "to_tsvector('simple', coalesce(case_title, '') || ' ' || coalesce(case_number, ''))"
+
+
+def _trgm_available() -> bool:
+    if context.is_offline_mode():
+        op.execute("-- assumes the pg_trgm extension is available on the target server")
+        return True
+    return bool(op.get_bind().execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar())
+
+
+def upgrade() -> None:
+    trgm = _trgm_available()
+    if trgm:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    else:
+        print("⚠️ pg_trgm is not available on this server; skipping trigram indexes.")
+    with op.get_context().autocommit_block():
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS pacer_cases_search_tsv_idx ON pacer_cases USING gin ({CASE_TSV})")
+        if trgm:
+            for col in ("case_title", "case_number"):
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS pacer_cases_{col}_trgm_idx "
+                    f"ON pacer_cases USING gin ({col} gin_trgm_ops)"
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for col in ("case_title", "case_number"):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS pacer_cases_{col}_trgm_idx")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS pacer_cases_search_tsv_idx")
@@ -0,0 +1,84 @@
+"""case enrichment: parsed ECF summary, parties, attorneys and charges
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Filled by enrich.py. case_enrichment keeps one row per case with the hash of
+the pacer_cases fields it was built from (source_hash), so unchanged cases are
+not fetched again, and of the parsed result (parsed_hash), so a re-check that
+parses to the same data does not rewrite it. Child rows are replaced as a set
+and everything cascades with pacer_cases.
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS case_enrichment (
+            case_id     bigint PRIMARY KEY REFERENCES pacer_cases (case_id) ON DELETE CASCADE,
+            status      text NOT NULL,                  -- ok | failed
+            source_hash text,
+            parsed_hash   text,
+            summary     jsonb,
+            attempts    integer NOT NULL DEFAULT 0,
+            error       text,
+            fetched_at  timestamptz,                    -- last time the parsed data changed
+            checked_at  timestamptz NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS case_enrichment_status_checked_idx ON case_enrichment (status, checked_at)")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS case_parties (
+            id       bigserial PRIMARY KEY,
+            case_id  bigint NOT NULL REFERENCES pacer_cases (case_id) ON DELETE CASCADE,
+            position integer NOT NULL,
+            role     text,
+            name     text NOT NULL,
+            details  text
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS case_attorneys (
+            id             bigserial PRIMARY KEY,
+            case_id        bigint NOT NULL REFERENCES pacer_cases (case_id) ON DELETE CASCADE,
+            party_position integer,
+            name           text NOT NULL,
+            firm           text,
+            contact        text,
+            designation    text
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS case_charges (
+            id           bigserial PRIMARY KEY,
+            case_id      bigint NOT NULL REFERENCES pacer_cases (case_id) ON DELETE CASCADE,
+            defendant    text,
+            status       text,                          -- pending | terminated | complaint
+            count_number text,
+            description  text NOT NULL,
+            disposition  text
+        )
+        """
+    )
+    for table in ("case_parties", "case_attorneys", "case_charges"):
+        op.execute(f"CREATE INDEX IF NOT EXISTS {table}_case_id_idx ON {table} (case_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS case_parties_name_idx ON case_parties (lower(name))")
+    op.execute("CREATE INDEX IF NOT EXISTS case_attorneys_name_idx ON case_attorneys (lower(name))")
+
+
+def downgrade() -> None:
+    for table in ("case_charges", "case_attorneys", "case_parties", "case_enrichment"):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
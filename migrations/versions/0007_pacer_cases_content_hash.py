@@ -0,0 +1,49 @@
+"""pacer_cases.content_hash: skip rewriting cases that did not change
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+db.bulk_upsert_cases stores a hash of the case columns and only updates a row
+when the incoming hash differs, so re-ingesting the same search does not churn
+WAL, indexes and dead tuples. Existing rows are hashed here in batches so the
+first re-ingest after the upgrade already counts them as unchanged.
+Offline (--sql) the id range is unknown, so the script hashes them in one
+set-based UPDATE instead.
+"""
+from alembic import context, op
+from sqlalchemy import text
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Must match db.CASE_CONTENT_HASH, or every existing row looks changed once
+CASE_CONTENT_HASH = (
+    "md5(json_build_array(court_id, case_id, case_number, case_type, case_title, date_filed, "
+    "jurisdiction_type, case_link, case_summary, parties, attorney)::text)"
+)
+BACKFILL_BATCH = 10_000
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE pacer_cases ADD COLUMN IF NOT EXISTS content_hash text")
+    if context.is_offline_mode():
+        op.execute(f"UPDATE pacer_cases SET content_hash = {CASE_CONTENT_HASH} WHERE content_hash IS NULL")
+        return
+    # Short transactions over id ranges rather than one table-wide UPDATE
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        lo, hi = bind.execute(text("SELECT min(id), max(id) FROM pacer_cases")).one()
+        if lo is None:
+            return
+        for start in range(lo, hi + 1, BACKFILL_BATCH):
+            bind.execute(text(
+                f"UPDATE pacer_cases SET content_hash = {CASE_CONTENT_HASH} "
+                f"WHERE id >= {start} AND id < {start + BACKFILL_BATCH} AND content_hash IS NULL"
+            ))
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE pacer_cases DROP COLUMN IF EXISTS content_hash")
@@ -0,0 +1,36 @@
+"""pacer_cases.opportunity_score: digital-forensics relevance, sortable in the grid
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Filled by scoring.py. The score is NOT NULL DEFAULT 0 so unscored cases sort
+last when the grid orders by score descending, and (opportunity_score, case_id)
+gets the same keyset index as the other sortable columns. score_hash records
+the inputs a score was computed from (content_hash, the enrichment's
+parsed_hash and scoring.SCORING_VERSION); NULL means not scored yet.
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant default is a catalog-only change, no table rewrite
+    op.execute("ALTER TABLE pacer_cases ADD COLUMN IF NOT EXISTS opportunity_score smallint NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE pacer_cases ADD COLUMN IF NOT EXISTS score_hash text")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS pacer_cases_opportunity_score_case_id_idx "
+            "ON pacer_cases (opportunity_score, case_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS pacer_cases_opportunity_score_case_id_idx")
+    op.execute("ALTER TABLE pacer_cases DROP COLUMN IF EXISTS score_hash")
+    op.execute("ALTER TABLE pacer_cases DROP COLUMN IF EXISTS opportunity_score")
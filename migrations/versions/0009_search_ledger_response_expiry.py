@@ -0,0 +1,31 @@
+"""pacer_search_ledger: index the rows that still hold a response
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+Responses are only read by dedup while younger than PACER_SEARCH_CACHE_TTL;
+pacer_api periodically nulls older ones (db.expire_search_responses). The
+partial index covers just the rows still holding a response, so each prune
+touches the few expired rows rather than scanning the whole ledger history.
+The first prune after the upgrade clears the existing backlog in batches.
+"""
+from alembic import op
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS pacer_search_ledger_response_created_at_idx "
+            "ON pacer_search_ledger (created_at) WHERE response IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS pacer_search_ledger_response_created_at_idx")
@@ -0,0 +1,34 @@
+"""pacer_search_ledger: batched multi-region searches carry no region
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+Pages of a batched /cases/find query (several regions' court_ids in one
+search) were recorded under the joined region names ("A, B"), which split
+the per-region cost report into ad-hoc groups. They are now stored with
+region NULL and reported by the courts in params; this moves existing rows
+over to the same form.
+"""
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE pacer_search_ledger SET region = NULL
+         WHERE region LIKE '%, %'
+           AND jsonb_typeof(params -> 'courtId') = 'array'
+           AND jsonb_array_length(params -> 'courtId') > 1
+        """
+    )
+
+
+def downgrade() -> None:
+    # The joined labels are not worth restoring
+    pass
@@ -0,0 +1,40 @@
+"""case_enrichment.source_hash: NULL-safe hash of the source case fields
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+db.CASE_SOURCE_HASH now hashes json_build_array(...) instead of
+concat_ws('|', ...), which skipped NULLs and so could not tell which field
+was missing. Stored hashes that still match their case under the old
+expression are rewritten to the new one; otherwise every enriched case would
+look changed and be fetched again from (billed) ECF pages.
+"""
+from alembic import op
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+OLD_SOURCE_HASH = "md5(concat_ws('|', p.court_id, p.case_number, p.case_title, p.date_filed, p.case_link))"
+# Must match db.CASE_SOURCE_HASH
+NEW_SOURCE_HASH = "md5(json_build_array(p.court_id, p.case_number, p.case_title, p.date_filed, p.case_link)::text)"
+
+
+def _rehash(old: str, new: str) -> None:
+    op.execute(
+        f"""
+        UPDATE case_enrichment e SET source_hash = {new}
+          FROM pacer_cases p
+         WHERE p.case_id = e.case_id AND e.source_hash = {old}
+        """
+    )
+
+
+def upgrade() -> None:
+    _rehash(OLD_SOURCE_HASH, NEW_SOURCE_HASH)
+
+
+def downgrade() -> None:
+    _rehash(NEW_SOURCE_HASH, OLD_SOURCE_HASH)
@@ -1,11 +1,30 @@
 # link to API Guide: https://pacer.uscourts.gov/sites/default/files/files/PCL-API-Document_4.pdf
 
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
 import requests
-from typing import Dict, Any, Optional, List
-from db import get_conn
+import httpx
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from typing import Dict, Any, Optional, List, Iterable, Iterator, AsyncIterator, Tuple, Callable
+import metrics
+from db import (court_id_for_region, court_lookup, bulk_upsert_cases, expire_search_responses,
+                find_cached_search, record_search)
 
-# ===== Choose environment: "QA" or "PROD" =====
-ENV = "PROD"   # change to "PROD" when you're ready
+try:
+    import redis
+except ImportError:  # optional: only needed to share tokens across workers
+    redis = None
+
+# ===== Choose environment: "QA", "PROD" or "MOCK" (benchmarks/mock_pacer.py) =====
+ENV = os.environ.get("PACER_ENV", "PROD")   # change to "PROD" when you're ready
+MOCK_ROOT = os.environ.get("PACER_MOCK_URL", "http://127.0.0.1:8765")
 
 # ===== Credentials =====
 QA_USERNAME = 'krpopkin'
@@ -14,33 +33,211 @@ QA_PASSWORD = "Reallystupid1!"
 PROD_USERNAME = "provendataforensics"
 PROD_PASSWORD = "Yirshovi1!"
 
+# Cases written per upsert transaction when streaming search results
+UPSERT_CHUNK_SIZE = 1000
+
+# Multi-region fan-out: how many regions are searched at once, and the most
+# requests per second sent to any one PACER host
+MAX_CONCURRENT_SEARCHES = int(os.environ.get("PACER_MAX_CONCURRENCY", "4"))
+PER_HOST_RATE_LIMIT = float(os.environ.get("PACER_RATE_LIMIT", "5"))
+
+# nextGenCSO tokens are reused until TTL minus the refresh margin, then renewed.
+# Set REDIS_URL to share them between Reflex workers / sync jobs.
+TOKEN_TTL = float(os.environ.get("PACER_TOKEN_TTL", "3600"))
+TOKEN_REFRESH_MARGIN = float(os.environ.get("PACER_TOKEN_REFRESH_MARGIN", "300"))
+REDIS_URL = os.environ.get("REDIS_URL")
+
+# Shared HTTP clients: keep-alive pool size, bounded timeouts (seconds) and
+# exponential backoff on 429/5xx (Retry-After wins when the server sends it)
+HTTP_POOL_SIZE = int(os.environ.get("PACER_HTTP_POOL_SIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("PACER_HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.environ.get("PACER_HTTP_READ_TIMEOUT", "60"))
+HTTP_MAX_RETRIES = int(os.environ.get("PACER_HTTP_MAX_RETRIES", "4"))
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Identical /cases/find pages (same env, filters and page) are served from the
+# search ledger for this many seconds instead of being re-billed; 0 disables
+SEARCH_CACHE_TTL = float(os.environ.get("PACER_SEARCH_CACHE_TTL", "3600"))
+# Responses only serve dedup while younger than SEARCH_CACHE_TTL; older ones
+# are dropped from the ledger at most this often (seconds)
+SEARCH_RESPONSE_PRUNE_INTERVAL = float(os.environ.get("PACER_SEARCH_PRUNE_INTERVAL", "300"))
+_last_response_prune = 0.0
+
+# Multi-court batching: a multi-region pull puts up to BATCH_MAX_COURTS court_ids
+# in one /cases/find query (courtId takes a list) and fans the results back out
+# per region. A batch whose totalElements exceeds BATCH_MAX_RESULTS (PCL stops
+# paging at 100 pages of 54) is split in half until each query fits.
+BATCH_COURTS = os.environ.get("PACER_BATCH_COURTS", "on").lower() in ("1", "on", "true", "yes")
+BATCH_MAX_COURTS = int(os.environ.get("PACER_BATCH_MAX_COURTS", "20"))
+BATCH_MAX_RESULTS = int(os.environ.get("PACER_BATCH_MAX_RESULTS", "5400"))
+
 # ===== PACER PCL API endpoints =====
 CONFIG = {
     "QA": {
         "AUTH_URL": "https://qa-login.uscourts.gov/services/cso-auth",
         "PCL_API_ROOT": "https://qa-pcl.uscourts.gov/pcl-public-api/rest",
+        # No default: ecf.{court}.uscourts.gov is production, where every page
+        # is billed. Point this at a training/QA CM/ECF host to enrich in QA.
+        "ECF_URL": os.environ.get("PACER_QA_ECF_URL"),
         "USERNAME": QA_USERNAME,
         "PASSWORD": QA_PASSWORD,
     },
     "PROD": {
         "AUTH_URL": "https://pacer.login.uscourts.gov/services/cso-auth",
         "PCL_API_ROOT": "https://pcl.uscourts.gov/pcl-public-api/rest",
+        "ECF_URL": "https://ecf.{court}.uscourts.gov",
         "USERNAME": PROD_USERNAME,
         "PASSWORD": PROD_PASSWORD,
     },
+    # Local stand-in for offline benchmarking; never hits the real PACER service
+    "MOCK": {
+        "AUTH_URL": f"{MOCK_ROOT}/services/cso-auth",
+        "PCL_API_ROOT": f"{MOCK_ROOT}/pcl-public-api/rest",
+        "ECF_URL": f"{MOCK_ROOT}/ecf/{{court}}",
+        "USERNAME": "mock",
+        "PASSWORD": "mock",
+    },
 }
 
 def env_cfg(env: str) -> Dict[str, str]:
     if env not in CONFIG:
-        raise ValueError("ENV must be 'QA' or 'PROD'")
+        raise ValueError("ENV must be 'QA', 'PROD' or 'MOCK'")
     return CONFIG[env]
 
+# ===== Shared HTTP clients =====
+# Process-wide counters; read them to see how hard a load leaned on retries.
+RETRY_STATS: Dict[str, int] = {"requests": 0, "retries": 0, "retry_429": 0, "retry_5xx": 0, "retry_errors": 0, "gave_up": 0}
+_stats_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        RETRY_STATS[key] += 1
+    metrics.inc("pacer_http_events_total", event=key)
+
+def get_session() -> requests.Session:
+    """Keep-alive requests.Session shared by every sync PACER call."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+def get_async_client() -> httpx.AsyncClient:
+    """Keep-alive httpx.AsyncClient shared by async PACER calls on the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+        )
+        _async_client_loop = loop
+    return _async_client
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    if retry_after:
+        try:
+            return min(HTTP_BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                return min(HTTP_BACKOFF_MAX, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+    # exponential backoff with full jitter
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+def _should_retry(status: Optional[int], attempt: int) -> bool:
+    if attempt >= HTTP_MAX_RETRIES:
+        _count("gave_up")
+        return False
+    _count("retries")
+    if status is None:
+        _count("retry_errors")
+    elif status == 429:
+        _count("retry_429")
+    else:
+        _count("retry_5xx")
+    return True
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """POST on the shared session with timeouts and backoff on 429/5xx/connection errors."""
+    kwargs.setdefault("timeout", (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    attempt = 0
+    while True:
+        _count("requests")
+        try:
+            r = get_session().post(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if not _should_retry(None, attempt):
+                raise
+            delay = _retry_delay(attempt, None)
+            print(f"🔁 {type(e).__name__} on {url}; retrying in {delay:.1f}s")
+        else:
+            if r.status_code not in RETRY_STATUSES or not _should_retry(r.status_code, attempt):
+                return r
+            delay = _retry_delay(attempt, r.headers.get("Retry-After"))
+            print(f"🔁 {r.status_code} from {url}; retrying in {delay:.1f}s")
+        time.sleep(delay)
+        attempt += 1
+
+async def ahttp_post(url: str, client: Optional[httpx.AsyncClient] = None, **kwargs) -> httpx.Response:
+    """Async twin of http_post on the shared httpx client."""
+    return await ahttp_request("POST", url, client, **kwargs)
+
+async def ahttp_get(url: str, client: Optional[httpx.AsyncClient] = None, **kwargs) -> httpx.Response:
+    return await ahttp_request("GET", url, client, **kwargs)
+
+async def ahttp_request(method: str, url: str, client: Optional[httpx.AsyncClient] = None, **kwargs) -> httpx.Response:
+    """One request on the shared httpx client with backoff on 429/5xx/transport errors."""
+    client = client or get_async_client()
+    attempt = 0
+    while True:
+        _count("requests")
+        try:
+            r = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if not _should_retry(None, attempt):
+                raise
+            delay = _retry_delay(attempt, None)
+            print(f"🔁 {type(e).__name__} on {url}; retrying in {delay:.1f}s")
+        else:
+            if r.status_code not in RETRY_STATUSES or not _should_retry(r.status_code, attempt):
+                return r
+            delay = _retry_delay(attempt, r.headers.get("Retry-After"))
+            print(f"🔁 {r.status_code} from {url}; retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+def close_http_clients() -> None:
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+async def aclose_http_clients() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+@metrics.timed("pacer_auth")
 def authenticate(username: str, password: str, auth_url: str) -> Optional[str]:
     print(f"🔐 Authenticating to {ENV}...")
     headers = {"Content-Type": "application/json", "Accept": "application/json"}
     payload = {"loginId": username, "password": password}
 
-    r = requests.post(auth_url, headers=headers, json=payload, allow_redirects=False)
+    r = http_post(auth_url, headers=headers, json=payload, allow_redirects=False)
     print("📄 Raw Response:", r.status_code)
     try:
         j = r.json()
@@ -56,34 +253,126 @@ def authenticate(username: str, password: str, auth_url: str) -> Optional[str]:
     print("✅ Auth successful.")
     return token
 
+class TokenManager:
+    """
+    Caches one nextGenCSO token per environment, in-process and (if REDIS_URL is
+    set) in Redis so every worker reuses the same login. Tokens are renewed
+    `refresh_margin` seconds before `ttl` runs out; refresh(stale) forces a new
+    login after a 401 unless another caller already replaced the stale token.
+    """
+
+    def __init__(self, ttl: float = TOKEN_TTL, refresh_margin: float = TOKEN_REFRESH_MARGIN, redis_url: Optional[str] = REDIS_URL):
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, Tuple[str, float]] = {}  # env -> (token, expires_at)
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    def _key(self, env: str) -> str:
+        return f"cop:pacer_token:{env}"
+
+    def _fresh(self, entry: Optional[Tuple[str, float]]) -> Optional[str]:
+        if entry and entry[1] - self.refresh_margin > time.time():
+            return entry[0]
+        return None
+
+    def _load_shared(self, env: str) -> Optional[Tuple[str, float]]:
+        if not self._redis:
+            return None
+        try:
+            key = self._key(env)
+            token = self._redis.get(key)
+            ttl = self._redis.ttl(key)
+            if token and ttl and ttl > 0:
+                return token, time.time() + ttl
+        except redis.RedisError as e:
+            print(f"⚠️ Redis token cache unavailable: {e}")
+        return None
+
+    def _store(self, env: str, token: str) -> None:
+        self._tokens[env] = (token, time.time() + self.ttl)
+        if self._redis:
+            try:
+                self._redis.set(self._key(env), token, ex=int(self.ttl))
+            except redis.RedisError as e:
+                print(f"⚠️ Redis token cache unavailable: {e}")
+
+    def _drop(self, env: str) -> None:
+        self._tokens.pop(env, None)
+        if self._redis:
+            try:
+                self._redis.delete(self._key(env))
+            except redis.RedisError as e:
+                print(f"⚠️ Redis token cache unavailable: {e}")
+
+    def _login(self, env: str) -> Optional[str]:
+        cfg = env_cfg(env)
+        token = authenticate(cfg["USERNAME"], cfg["PASSWORD"], cfg["AUTH_URL"])
+        if token:
+            self._store(env, token)
+        else:
+            self._drop(env)
+        return token
+
+    def get(self, env: Optional[str] = None, force_refresh: bool = False) -> Optional[str]:
+        env = env or ENV
+        with self._lock:
+            if not force_refresh:
+                token = self._fresh(self._tokens.get(env))
+                if token:
+                    return token
+                shared = self._load_shared(env)
+                token = self._fresh(shared)
+                if token:
+                    self._tokens[env] = shared
+                    return token
+            return self._login(env)
+
+    def refresh(self, stale_token: Optional[str], env: Optional[str] = None) -> Optional[str]:
+        """Re-login after a 401, unless the cached token has already moved on from `stale_token`."""
+        env = env or ENV
+        with self._lock:
+            for entry in (self._tokens.get(env), self._load_shared(env)):
+                token = self._fresh(entry)
+                if token and token != stale_token:
+                    self._tokens[env] = entry
+                    return token
+            return self._login(env)
+
+    def invalidate(self, env: Optional[str] = None) -> None:
+        with self._lock:
+            self._drop(env or ENV)
+
+_token_manager: Optional[TokenManager] = None
+
+def token_manager() -> TokenManager:
+    global _token_manager
+    if _token_manager is None:
+        _token_manager = TokenManager()
+    return _token_manager
+
+def get_token(env: Optional[str] = None, force_refresh: bool = False) -> Optional[str]:
+    """Cached nextGenCSO token for `env` (defaults to ENV); logs in only when needed."""
+    return token_manager().get(env, force_refresh)
+
 def get_court_id_from_region(region: str) -> Optional[str]:
-    """Look up court_id from the court_ids table based on region name."""
+    """Look up court_id for a region name (served from db's in-process court_ids cache)."""
     if not region or region == "All":
         return None
-    
-    conn = get_conn()
-    try:
-        cur = conn.execute("SELECT court_id FROM court_ids WHERE region = %s", (region,))
-        result = cur.fetchone()
-        return result['court_id'] if result else None
-    finally:
-        conn.close()
-
-def search_cases_by_date(token: str, api_root: str, date_from: str, date_to: str = None, region: str = None, page: int = 0) -> List[Dict[str, Any]]:
-    if not token:
-        print("⚠️ No token available, skipping case search.")
-        return []
+    return court_id_for_region(region)
 
-    print("📅 Performing case search with date range and filters...")
-    url = f"{api_root}/cases/find?page={page}"
-    headers = {"Content-Type": "application/json", "Accept": "application/json", "X-NEXT-GEN-CSO": token}
-    
+def build_search_payload(date_from: str, date_to: str = None, region: str = None,
+                         court_ids: Optional[List[str]] = None) -> Dict[str, Any]:
     # Old payload (commented out)
     # payload = {"caseTitle": "Smith", "dateFiledFrom": date_from}
-    
-    # Look up court_id from region
-    court_id = get_court_id_from_region(region)
-    
+
+    # Look up court_id from region (a batched search passes its court_ids directly)
+    if court_ids is None:
+        court_id = get_court_id_from_region(region)
+        court_ids = [court_id] if court_id else []
+
     # New payload with dateFrom, dateTo, region, jurisdiction type, and case status
     payload = {
         "dateFiledFrom": date_from,
@@ -91,134 +380,488 @@ def search_cases_by_date(token: str, api_root: str, date_from: str, date_to: str
         "jurisdictionType": "cr",  # "cr" for criminal cases
         "caseStatus": "O"  # "O" for open cases, "C" for closed cases
     }
-    
-    # Add court_id if we found one for the region
-    if court_id:
-        payload["courtId"] = [court_id]  # courtId expects a list
 
+    # Add court_id(s) if we found any for the region
+    if court_ids:
+        payload["courtId"] = list(court_ids)  # courtId expects a list
+    return payload
+
+class ResultCapExceeded(Exception):
+    """Raised on the first page of a search whose totalElements is over max_results."""
+
+    def __init__(self, total: int, max_results: int):
+        super().__init__(f"{total} results over the {max_results} cap")
+        self.total = total
+        self.max_results = max_results
+
+class SearchFailed(Exception):
+    """A search page that still failed after retries (only raised when strict=True)."""
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least 1/rate seconds apart (rate <= 0 disables)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+# ===== Search ledger / dedup =====
+def search_query_hash(api_root: str, payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps([api_root, payload], sort_keys=True).encode()).hexdigest()
+
+def _ledger_lookup(query_hash: str, page: int) -> Optional[Dict[str, Any]]:
+    if SEARCH_CACHE_TTL <= 0:
+        return None
+    try:
+        return find_cached_search(query_hash, page, SEARCH_CACHE_TTL)
+    except Exception as e:
+        # The ledger is bookkeeping; never let it block a search
+        print(f"⚠️ Search ledger lookup failed: {type(e).__name__}: {e}")
+        return None
+
+def _ledger_record(region: Optional[str], query_hash: str, payload: Dict[str, Any], page: int, status: int,
+                   data: Optional[Dict[str, Any]], latency_ms: Optional[int], from_cache: bool = False) -> None:
+    rcpt = (data or {}).get("receipt") or {}
+    cases = (data or {}).get("content") or (data or {}).get("cases") or []
+    try:
+        record_search(
+            region, query_hash, payload, page, status,
+            search_fee=None if from_cache else rcpt.get("searchFee"),
+            billable_pages=None if from_cache else rcpt.get("billablePages"),
+            result_count=len(cases) if data is not None else None,
+            latency_ms=latency_ms,
+            # Kept only while dedup can serve it (see _ledger_prune)
+            response=None if from_cache or SEARCH_CACHE_TTL <= 0 else data,
+            from_cache=from_cache,
+        )
+        if not from_cache:
+            _ledger_prune()
+    except Exception as e:
+        print(f"⚠️ Search ledger write failed: {type(e).__name__}: {e}")
+
+def _ledger_prune() -> None:
+    global _last_response_prune
+    if SEARCH_CACHE_TTL <= 0 or time.monotonic() - _last_response_prune < SEARCH_RESPONSE_PRUNE_INTERVAL:
+        return
+    _last_response_prune = time.monotonic()  # before the UPDATE, so concurrent writers skip it
+    expired = expire_search_responses(SEARCH_CACHE_TTL)
+    if expired:
+        print(f"🧹 Dropped {expired} expired search response(s) from the ledger.")
+
+def _search_label(region: Optional[str], payload: Dict[str, Any]) -> str:
+    """Metric/log name of a search: its region, "batched" for multi-region court batches, else "All"."""
+    return region or ("batched" if payload.get("courtId") else "All")
+
+def fetch_search_page(api_root: str, headers: Dict[str, str], payload: Dict[str, Any], page: int,
+                      region: Optional[str] = None) -> Tuple[int, str, Optional[Dict[str, Any]]]:
+    """
+    One /cases/find page, served from the ledger when an identical query ran
+    within SEARCH_CACHE_TTL; live calls are recorded with fee, pages and latency.
+    Returns (status, reason, data).
+    """
+    query_hash = search_query_hash(api_root, payload)
+    cached = _ledger_lookup(query_hash, page)
+    if cached is not None:
+        print(f"♻️ Serving {_search_label(region, payload)} page {page} from the search ledger.")
+        cached = {k: v for k, v in cached.items() if k != "receipt"}  # nothing billed this time
+        _ledger_record(region, query_hash, payload, page, 200, cached, 0, from_cache=True)
+        metrics.inc("pacer_search_pages_total", source="ledger", status=200)
+        return 200, "OK", cached
+
+    t0 = time.perf_counter()
+    with metrics.timed("pacer_search_page", region=_search_label(region, payload)):
+        r = http_post(f"{api_root}/cases/find?page={page}", headers=headers, json=payload)
+    latency_ms = int((time.perf_counter() - t0) * 1000)
+    metrics.inc("pacer_search_pages_total", source="live", status=r.status_code)
+    data = r.json() if r.status_code == 200 else None
+    _ledger_record(region, query_hash, payload, page, r.status_code, data, latency_ms)
+    return r.status_code, r.reason, data
+
+async def afetch_search_page(api_root: str, headers: Dict[str, str], payload: Dict[str, Any], page: int,
+                             region: Optional[str] = None, limiter: Optional[HostRateLimiter] = None,
+                             client: Optional[httpx.AsyncClient] = None) -> Tuple[int, str, Optional[Dict[str, Any]]]:
+    """Async twin of fetch_search_page (ledger I/O runs in a worker thread)."""
+    query_hash = search_query_hash(api_root, payload)
+    cached = await asyncio.to_thread(_ledger_lookup, query_hash, page)
+    if cached is not None:
+        print(f"♻️ Serving {_search_label(region, payload)} page {page} from the search ledger.")
+        cached = {k: v for k, v in cached.items() if k != "receipt"}  # nothing billed this time
+        await asyncio.to_thread(_ledger_record, region, query_hash, payload, page, 200, cached, 0, True)
+        metrics.inc("pacer_search_pages_total", source="ledger", status=200)
+        return 200, "OK", cached
+
+    url = f"{api_root}/cases/find?page={page}"
+    if limiter:
+        await limiter.wait(url)
+    t0 = time.perf_counter()
+    with metrics.timed("pacer_search_page", region=_search_label(region, payload)):
+        r = await ahttp_post(url, client, headers=headers, json=payload)
+    latency_ms = int((time.perf_counter() - t0) * 1000)
+    metrics.inc("pacer_search_pages_total", source="live", status=r.status_code)
+    data = r.json() if r.status_code == 200 else None
+    await asyncio.to_thread(_ledger_record, region, query_hash, payload, page, r.status_code, data, latency_ms)
+    return r.status_code, r.reason_phrase, data
+
+def iter_cases_by_date(token: str, api_root: str, date_from: str, date_to: str = None, region: str = None, page: int = 0,
+                       court_ids: Optional[List[str]] = None, strict: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Walk every page of /cases/find (from `page` up to pageInfo.totalPages) and
+    yield cases as each page arrives, so callers never hold the full result set.
+    With `strict`, a page that fails (or a failed re-login) raises SearchFailed
+    instead of ending the walk, so callers can tell a partial result from a full one.
+    """
+    if not token:
+        print("⚠️ No token available, skipping case search.")
+        return
+
+    print("📅 Performing case search with date range and filters...")
+    headers = {"Content-Type": "application/json", "Accept": "application/json", "X-NEXT-GEN-CSO": token}
+    payload = build_search_payload(date_from, date_to, region, court_ids)
     #print("📤 Payload sent:", payload)
-    r = requests.post(url, headers=headers, json=payload)
-    #print("📬 Response body:", r.text)
 
-    if r.status_code != 200:
-        print(f"❌ ERROR {r.status_code}: {r.reason}")
-        return []
+    first_page = page
+    reauthed = False
+    while True:
+        status, reason, data = fetch_search_page(api_root, headers, payload, page, region)
 
-    data: Dict[str, Any] = r.json()
-    if "receipt" in data:
-        rcpt = data["receipt"]
-        print(f"🧾 Receipt: fee={rcpt.get('searchFee')} pages={rcpt.get('billablePages')}")
+        if status == 401 and not reauthed:
+            # Token expired server-side: log in again once and retry this page
+            reauthed = True
+            token = token_manager().refresh(token)
+            if not token:
+                print("❌ Re-authentication failed.")
+                if strict:
+                    raise SearchFailed(f"re-authentication failed ({region})")
+                return
+            headers["X-NEXT-GEN-CSO"] = token
+            continue
+
+        if status != 200:
+            print(f"❌ ERROR {status}: {reason} (page {page})")
+            if strict:
+                raise SearchFailed(f"{status} {reason} ({region}, page {page})")
+            return
+
+        if "receipt" in data:
+            rcpt = data["receipt"]
+            print(f"🧾 Receipt: fee={rcpt.get('searchFee')} pages={rcpt.get('billablePages')}")
+
+        cases = data.get("content") or data.get("cases") or []
+        page_info = data.get("pageInfo") or {}
+        if page == first_page:
+            print(f"✅ Found {page_info.get('totalElements', len(cases))} cases "
+                  f"across {page_info.get('totalPages', 1)} page(s).")
 
-    cases = data.get("content") or data.get("cases") or []
-    print(f"✅ Found {data.get('pageInfo', {}).get('totalElements', len(cases))} cases (showing all).")
-    return cases
+        yield from cases
 
-def upsert_pacer_cases(cases: List[Dict[str, Any]]) -> int:
+        page += 1
+        total_pages = page_info.get("totalPages")
+        if not cases or page_info.get("last") or total_pages is None or page >= total_pages:
+            return
+
+def search_cases_by_date(token: str, api_root: str, date_from: str, date_to: str = None, region: str = None, page: int = 0,
+                         court_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """List form of iter_cases_by_date; prefer the iterator for wide date ranges."""
+    return list(iter_cases_by_date(token, api_root, date_from, date_to, region, page, court_ids))
+
+async def aiter_cases_by_date(token: str, api_root: str, date_from: str, date_to: str = None, region: str = None,
+                              limiter: Optional[HostRateLimiter] = None,
+                              client: Optional[httpx.AsyncClient] = None,
+                              court_ids: Optional[List[str]] = None,
+                              max_results: Optional[int] = None,
+                              strict: bool = False,
+                              label: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
     """
-    Insert new cases and update existing ones (matched on case_id).
-    Returns the total number of rows affected (inserted + updated).
+    Async twin of iter_cases_by_date; yields one list of cases per result page.
+    With `max_results`, raises ResultCapExceeded (before yielding anything) when
+    the first page reports more results than that. With `strict`, a page that
+    fails (or a failed re-login) raises SearchFailed instead of ending the walk.
+    `label` names the search in log lines (default: `region`).
     """
-    if not cases:
-        return 0
+    label = label or region
+    if not token:
+        print("⚠️ No token available, skipping case search.")
+        return
+
+    headers = {"Content-Type": "application/json", "Accept": "application/json", "X-NEXT-GEN-CSO": token}
+    # court_id lookup may hit the DB; keep it off the event loop
+    payload = await asyncio.to_thread(build_search_payload, date_from, date_to, region, court_ids)
 
-    inserted = 0
-    updated = 0
+    page = 0
+    reauthed = False
+    while True:
+        status, reason, data = await afetch_search_page(api_root, headers, payload, page, region, limiter, client)
 
-    for c in cases:
-        case_id = c.get("caseId")
-        if case_id is None:
-            # Skip rows without a caseId (cannot match/update deterministically)
+        if status == 401 and not reauthed:
+            # Token expired server-side: log in again once and retry this page
+            reauthed = True
+            token = await asyncio.to_thread(token_manager().refresh, token)
+            if not token:
+                print(f"❌ Re-authentication failed ({label}).")
+                if strict:
+                    raise SearchFailed(f"re-authentication failed ({label})")
+                return
+            headers["X-NEXT-GEN-CSO"] = token
             continue
 
-        cn = c.get("caseNumber")
-        cn_str = str(cn) if cn is not None else None
+        if status != 200:
+            print(f"❌ ERROR {status}: {reason} ({label}, page {page})")
+            if strict:
+                raise SearchFailed(f"{status} {reason} ({label}, page {page})")
+            return
 
-        case_summary_url = (
-            f"https://ecf.casd.uscourts.gov/cgi-bin/qrySummary.pl?{cn_str}"
-            if cn_str else None
-        )
-        parties_url = (
-            f"https://ecf.casd.uscourts.gov/cgi-bin/qryParties.pl?{cn_str}"
-            if cn_str else None
-        )
-        attorney_url = (
-            f"https://ecf.casd.uscourts.gov/cgi-bin/qryAttorneys.pl?{cn_str}"
-            if cn_str else None
-        )
+        if "receipt" in data:
+            rcpt = data["receipt"]
+            print(f"🧾 Receipt ({label}): fee={rcpt.get('searchFee')} pages={rcpt.get('billablePages')}")
+
+        cases = data.get("content") or data.get("cases") or []
+        page_info = data.get("pageInfo") or {}
+        if page == 0:
+            total = page_info.get("totalElements", len(cases))
+            if max_results is not None and total > max_results:
+                raise ResultCapExceeded(total, max_results)
+            print(f"✅ {label}: {total} cases "
+                  f"across {page_info.get('totalPages', 1)} page(s).")
+        if cases:
+            yield cases
 
-        # Get fresh connection for each case to avoid prepared statement conflicts
-        conn = get_conn()
+        page += 1
+        total_pages = page_info.get("totalPages")
+        if not cases or page_info.get("last") or total_pages is None or page >= total_pages:
+            return
+
+def plan_court_batches(regions: List[str], max_courts: int = BATCH_MAX_COURTS
+                       ) -> Tuple[List[List[str]], Dict[str, str], List[str]]:
+    """
+    Group the court_ids of `regions` into batches of at most `max_courts`.
+    Returns (batches, court_id -> region, regions to search on their own), the
+    last being "All"/unknown regions that have no court_id to batch.
+    """
+    region_courts = court_lookup()["region_courts"]
+    court_regions: Dict[str, str] = {}
+    singles: List[str] = []
+    for region in regions:
+        courts = region_courts.get(region) if region and region != "All" else None
+        if not courts:
+            singles.append(region)
+            continue
+        for court in courts:
+            court_regions.setdefault(court, region)
+    courts = list(court_regions)
+    size = max(1, max_courts)
+    return [courts[i:i + size] for i in range(0, len(courts), size)], court_regions, singles
+
+def split_by_region(cases: List[Dict[str, Any]], court_regions: Dict[str, str],
+                    fallback: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Fan one batched result page back out to {region: cases} by courtId."""
+    by_region: Dict[str, List[Dict[str, Any]]] = {}
+    for c in cases:
+        court = c.get("courtId") or ""
+        region = court_regions.get(court) or court_regions.get(court.lower()) or fallback
+        by_region.setdefault(region, []).append(c)
+    return by_region
+
+async def aiter_court_batch(token: str, api_root: str, date_from: str, date_to: str, courts: List[str],
+                            court_regions: Dict[str, str], limiter: Optional[HostRateLimiter] = None,
+                            client: Optional[httpx.AsyncClient] = None,
+                            max_results: int = BATCH_MAX_RESULTS,
+                            strict: bool = False) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield result pages for several courts in as few queries as `max_results` allows.
+    `strict` is passed to aiter_cases_by_date (SearchFailed on a failed page).
+    The pages span regions, so they reach the ledger with region NULL (the
+    courts are in its params) and metrics as region="batched".
+    """
+    label = ", ".join(dict.fromkeys(court_regions[c] for c in courts))
+    try:
+        async for cases in aiter_cases_by_date(token, api_root, date_from, date_to, None, limiter, client,
+                                               court_ids=courts,
+                                               max_results=max_results if len(courts) > 1 else None,
+                                               strict=strict, label=label):
+            yield cases
+    except ResultCapExceeded as e:
+        mid = len(courts) // 2
+        print(f"✂️ {label}: {e}; splitting {len(courts)} courts into {mid} + {len(courts) - mid}.")
+        for half in (courts[:mid], courts[mid:]):
+            async for cases in aiter_court_batch(token, api_root, date_from, date_to, half, court_regions,
+                                                 limiter, client, max_results, strict):
+                yield cases
+
+async def search_regions_concurrently(token: str, api_root: str, date_from: str, date_to: str, regions: List[str],
+                                      max_concurrency: int = MAX_CONCURRENT_SEARCHES,
+                                      rate_limit: float = PER_HOST_RATE_LIMIT,
+                                      on_status: Optional[Callable[[str, str], None]] = None,
+                                      batch_courts: bool = BATCH_COURTS) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Search every region at once (at most `max_concurrency` in flight, `rate_limit`
+    req/s per host) and yield (region, cases) per result page as pages complete,
+    so the caller can upsert incrementally instead of waiting for the slowest court.
+    With `batch_courts`, regions' court_ids share /cases/find queries (see
+    plan_court_batches) and each page is split back out per region.
+    `on_status(region, status)` is told when a region is "running", "done" or "failed".
+    """
+    if not token or not regions:
+        return
+
+    limiter = HostRateLimiter(rate_limit)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    # Bounded so slow consumers (DB writes) apply back-pressure to the fetchers
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_concurrency) * 2)
+    done = object()
+
+    def report(region: str, status: str) -> None:
+        if on_status:
+            on_status(region, status)
+
+    async def fetch_region(region: str) -> None:
         try:
-            with conn.cursor() as cur:
-                # 1) Try UPDATE first (match on case_id)
-                cur.execute(
-                    """
-                    UPDATE pacer_cases
-                       SET court_id = %s,
-                           case_number = %s,
-                           case_type = %s,
-                           case_title = %s,
-                           date_filed = %s,
-                           jurisdiction_type = %s,
-                           case_link = %s,
-                           case_summary = %s,
-                           parties = %s,
-                           attorney = %s
-                     WHERE case_id = %s
-                    """,
-                    (
-                        c.get("courtId"),
-                        c.get("caseNumber"),
-                        c.get("caseType"),
-                        c.get("caseTitle"),
-                        c.get("dateFiled"),
-                        c.get("jurisdictionType"),
-                        c.get("caseLink"),
-                        case_summary_url,
-                        parties_url,
-                        attorney_url,
-                        case_id,
-                    ),
-                )
-
-                if cur.rowcount and cur.rowcount > 0:
-                    updated += cur.rowcount
-                else:
-                    # 2) If no row was updated, INSERT a new one
-                    cur.execute(
-                        """
-                        INSERT INTO pacer_cases (
-                            court_id, case_id, case_number, case_type, case_title, date_filed,
-                            jurisdiction_type, case_link, case_summary, parties, attorney
-                        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                        """,
-                        (
-                            c.get("courtId"),
-                            case_id,
-                            c.get("caseNumber"),
-                            c.get("caseType"),
-                            c.get("caseTitle"),
-                            c.get("dateFiled"),
-                            c.get("jurisdictionType"),
-                            c.get("caseLink"),
-                            case_summary_url,
-                            parties_url,
-                            attorney_url,
-                        ),
-                    )
-                    inserted += 1
-            
-            conn.commit()
-        finally:
-            conn.close()
-
-    #print(f"💾 Upsert complete: inserted={inserted}, updated={updated}")
-    return inserted + updated
+            async with semaphore:
+                report(region, "running")
+                # strict: a page that still fails after retries (or a second 401)
+                # must mark the region failed, not finish it with partial results
+                async for cases in aiter_cases_by_date(token, api_root, date_from, date_to, region, limiter,
+                                                       strict=True):
+                    await queue.put((region, cases))
+            report(region, "done")
+        except Exception as e:
+            print(f"❌ Search failed for {region}: {type(e).__name__}: {e}")
+            report(region, "failed")
+        await queue.put(done)
+
+    if batch_courts:
+        batches, court_regions, singles = await asyncio.to_thread(plan_court_batches, regions)
+    else:
+        batches, court_regions, singles = [], {}, list(regions)
+    # A region's courts can land in several batches; it is done when all of them are
+    pending: Dict[str, int] = {}
+    failed: set = set()
+    for batch in batches:
+        for region in dict.fromkeys(court_regions[c] for c in batch):
+            pending[region] = pending.get(region, 0) + 1
+
+    async def fetch_batch(courts: List[str]) -> None:
+        batch_regions = list(dict.fromkeys(court_regions[c] for c in courts))
+        ok = False
+        try:
+            async with semaphore:
+                for region in batch_regions:
+                    report(region, "running")
+                async for cases in aiter_court_batch(token, api_root, date_from, date_to, courts,
+                                                     court_regions, limiter, strict=True):
+                    for region, region_cases in split_by_region(cases, court_regions, batch_regions[0]).items():
+                        await queue.put((region, region_cases))
+            ok = True
+        except Exception as e:
+            print(f"❌ Search failed for {', '.join(batch_regions)}: {type(e).__name__}: {e}")
+        for region in batch_regions:
+            if not ok:
+                failed.add(region)
+            pending[region] -= 1
+            if not pending[region]:
+                report(region, "failed" if region in failed else "done")
+        await queue.put(done)
+
+    tasks = [asyncio.create_task(fetch_region(region)) for region in singles]
+    tasks += [asyncio.create_task(fetch_batch(batch)) for batch in batches]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+def ecf_court(court_id: str) -> str:
+    """PCL courtId -> ECF host label: district 'casdc' -> 'casd', bankruptcy 'casbk' -> 'casb'."""
+    court = (court_id or "").strip().lower()
+    if court.endswith(("dc", "bk")):
+        return court[:-1]
+    return court
+
+def ecf_url(court_id: Optional[str], script: str, case_id: Any, env: Optional[str] = None) -> Optional[str]:
+    """Link to an ECF query page (qrySummary.pl, qryParties.pl, ...) on the case's own court."""
+    base = env_cfg(env or ENV).get("ECF_URL")
+    if not base or not court_id or case_id is None:
+        return None
+    base = base.format(court=ecf_court(court_id))
+    return f"{base}/cgi-bin/{script}?{case_id}"
+
+def case_to_row(c: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a PCL API case object onto pacer_cases columns."""
+    # ECF query pages take the ECF case id (same as caseLink's iqquerymenu.pl?<caseId>)
+    court_id, case_id = c.get("courtId"), c.get("caseId")
+    return {
+        "court_id": court_id,
+        "case_id": case_id,
+        "case_number": c.get("caseNumber"),
+        "case_type": c.get("caseType"),
+        "case_title": c.get("caseTitle"),
+        "date_filed": c.get("dateFiled"),
+        "jurisdiction_type": c.get("jurisdictionType"),
+        "case_link": c.get("caseLink"),
+        "case_summary": ecf_url(court_id, "qrySummary.pl", case_id),
+        "parties": ecf_url(court_id, "qryParties.pl", case_id),
+        "attorney": ecf_url(court_id, "qryAttorneys.pl", case_id),
+    }
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def upsert_pacer_cases(cases: Iterable[Dict[str, Any]], chunk_size: int = UPSERT_CHUNK_SIZE,
+                       return_rows: bool = False) -> Dict[str, Any]:
+    """
+    Insert new cases and update existing ones (matched on case_id).
+    Accepts any iterable (e.g. iter_cases_by_date) and writes it in chunks of
+    `chunk_size`, one set-based transaction per chunk.
+    Cases whose content did not change are not rewritten.
+    Returns {"inserted": n, "updated": m, "unchanged": k}, plus the written rows
+    under "inserted_rows"/"updated_rows" when return_rows=True.
+    """
+    counts: Dict[str, Any] = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if return_rows:
+        counts.update(inserted_rows=[], updated_rows=[])
+    # Skip rows without a caseId (cannot match/update deterministically)
+    rows = (case_to_row(c) for c in cases or [] if c.get("caseId") is not None)
+    for chunk in chunked(rows, chunk_size):
+        part = bulk_upsert_cases(chunk, return_rows)
+        counts["inserted"] += part["inserted"]
+        counts["updated"] += part["updated"]
+        counts["unchanged"] += part["unchanged"]
+        if return_rows:
+            counts["inserted_rows"].extend(part["inserted_rows"])
+            counts["updated_rows"].extend(part["updated_rows"])
+    #print(f"💾 Upsert complete: inserted={counts['inserted']}, updated={counts['updated']}, unchanged={counts['unchanged']}")
+    return counts
 
 if __name__ == "__main__":
     cfg = env_cfg(ENV)
-    token = authenticate(cfg["USERNAME"], cfg["PASSWORD"], cfg["AUTH_URL"])
-    cases = search_cases_by_date(token, cfg["PCL_API_ROOT"], "2024-01-01")
-    
-    n = upsert_pacer_cases(cases)
-    print(f"💾 Upserted {n} row(s) into pacer_cases.")
\ No newline at end of file
+    token = get_token(ENV)
+    cases = iter_cases_by_date(token, cfg["PCL_API_ROOT"], "2024-01-01")
+
+    counts = upsert_pacer_cases(cases)
+    print(f"💾 Upserted {counts['inserted'] + counts['updated']} row(s) into pacer_cases "
+          f"(inserted={counts['inserted']}, updated={counts['updated']}, unchanged={counts['unchanged']}).")
\ No newline at end of file
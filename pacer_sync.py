@@ -0,0 +1,118 @@
+# pacer_sync.py — scheduled incremental PACER sync
+#
+# Each region keeps a high-water mark (latest dateFiled seen + last run time) in
+# pacer_sync_state, so a run only asks PACER for the delta window
+# [mark - overlap, today] instead of the whole history.
+#
+#   python pacer_sync.py                        # one pass over every region (cron)
+#   python pacer_sync.py --region "California Southern"
+#   python pacer_sync.py --loop --interval-hours 24
+#
+# Regions without a mark start from --since (default: INITIAL_LOOKBACK_DAYS ago).
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import pacer_api
+import scoring
+from db import fetch_all_regions, fetch_sync_states, record_sync_run
+
+INITIAL_LOOKBACK_DAYS = 30
+# Cases are sometimes indexed in PCL a day or two after their filing date, so
+# each run re-reads a short tail behind the mark (upserts make this idempotent)
+OVERLAP_DAYS = 2
+
+
+def sync_window(mark: Optional[date], since: Optional[date] = None, overlap_days: int = OVERLAP_DAYS,
+                today: Optional[date] = None) -> tuple[str, str]:
+    today = today or date.today()
+    if mark is None:
+        start = since or (today - timedelta(days=INITIAL_LOOKBACK_DAYS))
+    else:
+        start = mark - timedelta(days=overlap_days)
+    return min(start, today).isoformat(), today.isoformat()
+
+
+def high_water_mark(state: Optional[Dict[str, Any]]) -> Optional[date]:
+    """Latest dateFiled seen, or the day of the last clean run if that is later
+    (quiet courts would otherwise re-query an ever-growing window)."""
+    if not state:
+        return None
+    mark = state.get("last_date_filed")
+    last_run = state.get("last_run_at")
+    if state.get("last_status") == "ok" and last_run is not None:
+        mark = max(mark, last_run.date()) if mark else last_run.date()
+    return mark
+
+
+def _track_latest(cases: Iterable[Dict[str, Any]], seen: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    # dateFiled is ISO (YYYY-MM-DD...), so string max == date max
+    for c in cases:
+        filed = (c.get("dateFiled") or "")[:10]
+        if filed and filed > seen.get("latest", ""):
+            seen["latest"] = filed
+        seen["count"] = seen.get("count", 0) + 1
+        yield c
+
+
+def sync_region(token: str, api_root: str, region: str, mark: Optional[date],
+                since: Optional[date] = None, overlap_days: int = OVERLAP_DAYS) -> Dict[str, Any]:
+    date_from, date_to = sync_window(mark, since, overlap_days)
+    print(f"🔄 {region}: {date_from} → {date_to} (mark={mark})")
+    seen: Dict[str, Any] = {}
+    try:
+        counts = pacer_api.upsert_pacer_cases(
+            _track_latest(pacer_api.iter_cases_by_date(token, api_root, date_from, date_to, region, strict=True), seen)
+        )
+    except Exception as e:
+        # Keep the mark this run started from (it may come from the last clean
+        # run's date, which a failed status no longer counts), so the next run
+        # searches this window again; cases already written are simply upserted
+        print(f"❌ {region}: {type(e).__name__}: {e}")
+        record_sync_run(region, mark, f"failed: {type(e).__name__}", seen.get("count", 0))
+        return {"region": region, "status": "failed"}
+
+    record_sync_run(region, seen.get("latest"), "ok", seen.get("count", 0))
+    print(f"💾 {region}: fetched={seen.get('count', 0)} inserted={counts['inserted']} updated={counts['updated']} "
+          f"unchanged={counts['unchanged']}")
+    return {"region": region, "status": "ok", **counts}
+
+
+def run_once(regions: Optional[list[str]] = None, since: Optional[date] = None,
+             overlap_days: int = OVERLAP_DAYS) -> list[Dict[str, Any]]:
+    cfg = pacer_api.env_cfg(pacer_api.ENV)
+    token = pacer_api.get_token(pacer_api.ENV)
+    if not token:
+        print("❌ Sync aborted: authentication failed.")
+        return []
+
+    regions = regions or [r["region_name"] for r in fetch_all_regions()]
+    marks = fetch_sync_states()
+    results = []
+    for region in regions:
+        mark = high_water_mark(marks.get(region))
+        results.append(sync_region(token, cfg["PCL_API_ROOT"], region, mark, since, overlap_days))
+    scored = scoring.score_pending()
+    print(f"🎯 Scored {scored['scored']} new/changed case(s).")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental PACER sync using per-region high-water marks.")
+    parser.add_argument("--region", action="append", help="region name (repeatable); default: every region")
+    parser.add_argument("--since", type=date.fromisoformat, help="start date for regions with no mark yet")
+    parser.add_argument("--overlap-days", type=int, default=OVERLAP_DAYS)
+    parser.add_argument("--loop", action="store_true", help="keep running, one pass every --interval-hours")
+    parser.add_argument("--interval-hours", type=float, default=24.0)
+    args = parser.parse_args()
+
+    while True:
+        run_once(args.region, args.since, args.overlap_days)
+        if not args.loop:
+            break
+        time.sleep(args.interval_hours * 3600)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# scoring.py — digital-forensics opportunity score for pacer_cases
+#
+# Every case gets a 0-100 score from
+#   case_type    criminal / magistrate cases over civil ones
+#   case_title   search-warrant style titles naming phones, computers, accounts
+#   court_id     optional per-court weights (PACER_SCORE_COURT_WEIGHTS, JSON)
+#   charges      enriched statutes and descriptions (enrich.py -> case_charges);
+#                cases whose counts are all terminated are weighted down
+# computed with pandas/numpy a batch at a time and stored in
+# pacer_cases.opportunity_score, which the grid sorts on through its
+# (opportunity_score, case_id) index. A case is only rescored when its row, its
+# enrichment or SCORING_VERSION changes (pacer_cases.score_hash).
+#
+#   python scoring.py               # score new/changed cases
+#   python scoring.py --rescore     # recompute every case
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from db import fetch_scoring_batch, save_scores
+
+# Bump when the weights below change so existing scores are recomputed
+SCORING_VERSION = "1"
+SCORING_BATCH = int(os.environ.get("PACER_SCORING_BATCH", "5000"))
+
+CASE_TYPE_WEIGHTS = {"cr": 25, "mj": 20, "mc": 10, "po": 5, "cv": 0}
+COURT_WEIGHTS: Dict[str, float] = json.loads(os.environ.get("PACER_SCORE_COURT_WEIGHTS", "{}"))
+
+# (regex, points); matched case-insensitively, each pattern counts once
+TITLE_PATTERNS = (
+    (r"\b(?:search|seizure)\b", 15),
+    (r"\b(?:cell(?:ular)?|mobile|smart) ?phone|\biphone|\bandroid|\bsamsung", 25),
+    (r"\b(?:computer|laptop|hard drive|tablet|ipad|storage device|thumb drive|usb)\b", 25),
+    (r"\b(?:e-?mail|google|facebook|meta platforms|instagram|snapchat|apple|microsoft|yahoo|icloud|dropbox)\b", 20),
+    (r"\b(?:bitcoin|cryptocurrency|crypto|ethereum|wallet)\b", 20),
+    (r"\b(?:ip address|internet|online|website|domain)\b", 15),
+)
+TITLE_CAP = 40
+
+CHARGE_PATTERNS = (
+    (r"18:22(?:51|52|52A|60)|18:2422|child porn|sexual exploitation|enticement", 35),
+    (r"18:1030|computer fraud|unauthorized access|intrusion|ransomware", 35),
+    (r"18:(?:2511|2701)|wiretap|stored communications", 25),
+    (r"18:(?:1028A?|1029)|identity theft|access device", 25),
+    (r"18:(?:1343|1349)|wire fraud", 20),
+    (r"18:(?:2261A|875)|stalking|threat|extortion", 20),
+    (r"18:195[67]|money laundering", 15),
+    (r"21:(?:841|846|952|960|963)|controlled substance", 10),
+)
+CHARGE_CAP = 60
+# Counts that are all terminated leave little left to examine
+TERMINATED_FACTOR = 0.5
+
+
+def _pattern_points(text: pd.Series, patterns: Iterable) -> np.ndarray:
+    points = np.zeros(len(text))
+    for pattern, weight in patterns:
+        points += np.where(text.str.contains(pattern, case=False, regex=True), weight, 0)
+    return points
+
+
+def score_frame(df: pd.DataFrame) -> np.ndarray:
+    """Scores (int, 0-100) for a batch with case_type, court_id, case_title, charges, pending_counts."""
+    if df.empty:
+        return np.zeros(0, dtype=int)
+    case_type = df["case_type"].fillna("").str.lower().map(CASE_TYPE_WEIGHTS).fillna(0).to_numpy()
+    court = df["court_id"].fillna("").str.lower().map(COURT_WEIGHTS).fillna(0).to_numpy(dtype=float)
+    title = np.minimum(_pattern_points(df["case_title"].fillna(""), TITLE_PATTERNS), TITLE_CAP)
+    charges = np.minimum(_pattern_points(df["charges"].fillna(""), CHARGE_PATTERNS), CHARGE_CAP)
+    charges *= np.where(df["pending_counts"].to_numpy() > 0, 1.0, TERMINATED_FACTOR)
+    return np.clip(np.rint(case_type + court + title + charges), 0, 100).astype(int)
+
+
+def score_pending(batch_size: int = SCORING_BATCH, rescore: bool = False,
+                  case_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+    """Score every case whose inputs changed (or all of them with rescore); returns totals."""
+    totals = {"scored": 0, "batches": 0}
+    if case_ids is not None and not case_ids:
+        return totals
+    after = -1
+    while True:
+        rows = fetch_scoring_batch(SCORING_VERSION, after, batch_size, rescore, case_ids)
+        if not rows:
+            break
+        with metrics.timed("scoring_batch"):
+            df = pd.DataFrame(rows)
+            scores = score_frame(df)
+            totals["scored"] += save_scores(df["case_id"].tolist(), scores.tolist(), df["score_hash"].tolist())
+        totals["batches"] += 1
+        after = rows[-1]["case_id"]
+        if len(rows) < batch_size:
+            break
+    metrics.inc("scored_cases_total", totals["scored"])
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute digital-forensics opportunity scores for stored cases.")
+    parser.add_argument("--batch-size", type=int, default=SCORING_BATCH)
+    parser.add_argument("--rescore", action="store_true", help="recompute every case, not just changed ones")
+    args = parser.parse_args()
+
+    totals = score_pending(args.batch_size, args.rescore)
+    print(f"🎯 Scored {totals['scored']} case(s) in {totals['batches']} batch(es).")
+
+
+if __name__ == "__main__":
+    main()